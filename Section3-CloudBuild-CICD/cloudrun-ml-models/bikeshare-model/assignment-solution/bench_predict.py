@@ -0,0 +1,80 @@
+"""/predict throughput of the previous handler against the cached model.
+
+The previous handler ran joblib.load and built a one-row DataFrame on every
+request; the current one reuses the loaded model and a preallocated row.
+
+A RandomForest is fitted on ../hour.csv the way model-training.py does it
+(fewer trees by default, see --trees) and saved to a temporary directory.
+
+    python bench_predict.py -n 200
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+from bikeshare import fit_encoder, load_data, preprocess_data, save_encoder
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import make_pipeline
+
+import main
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def training_frame():
+    df = load_data(os.path.join(HERE, "..", "hour.csv"), cache_dir="")
+    encoder = fit_encoder(df)
+    X, y = preprocess_data(df, encoder)
+    return X, y, encoder
+
+
+def previous_handler(payload, path):
+    model = joblib.load(path)
+    return model.predict(pd.DataFrame(payload, index=[0])).tolist()
+
+
+def per_second(fn, n):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200)
+    parser.add_argument("--trees", type=int, default=20)
+    args = parser.parse_args()
+
+    X, y, encoder = training_frame()
+    payload = {name: float(value) for name, value in X.iloc[0].items()}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.joblib")
+        joblib.dump(make_pipeline(RandomForestRegressor(n_estimators=args.trees, random_state=0)).fit(X, y), path)
+        save_encoder(encoder, os.path.join(tmp, "encoder.json"))
+        print(f"model: {args.trees} trees, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        main.MODEL_PATH = path
+        main.ENCODER_PATH = os.path.join(tmp, "encoder.json")
+        main.MODEL_REFRESH_INTERVAL = 0
+        client = main.app.test_client()
+        model_state = main.load_model()
+
+        rows = {
+            "previous handler (load per call)": lambda: previous_handler(payload, path),
+            "cached model + DataFrame row": lambda: model_state.model.predict(pd.DataFrame(payload, index=[0])),
+            "cached model + preallocated row": lambda: model_state.predict(payload),
+            "/predict (Flask test client)": lambda: client.post("/predict", json=payload),
+        }
+        print(f"{'path':<36} {'req/s':>9}")
+        for name, fn in rows.items():
+            n = max(args.n // 10, 5) if name.startswith("previous") else args.n
+            print(f"{name:<36} {per_second(fn, n):>9.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,39 +1,158 @@
-import pandas as pd
-from flask import Flask, request, jsonify
-import joblib
+import io
+import json
 import os
+import threading
+import time
+import warnings
+
+import joblib
+import numpy as np
+from bikeshare import RawEncoder, load_encoder
+from flask import Flask, request, jsonify
 from google.cloud import storage
 
 app = Flask(__name__)
-model = None
 
-def load_model():
-    model = joblib.load("model.joblib")
-    return model
+MODEL_PATH = os.environ.get("MODEL_PATH", "model.joblib")
+USE_GCS_MODEL = os.environ.get("USE_GCS_MODEL", "false").lower() == "true"
+MODEL_BUCKET = os.environ.get("MODEL_BUCKET", "sid-kubeflow-v1")
+MODEL_BLOB = os.environ.get("MODEL_BLOB", "bikeshare-model/artifact/model.joblib")
+# One-hot layout written by model-training.py; lets /predict take raw hour.csv fields.
+ENCODER_PATH = os.environ.get("ENCODER_PATH", "encoder.json")
+ENCODER_BLOB = os.environ.get("ENCODER_BLOB", "bikeshare-model/artifact/encoder.json")
+# Seconds between checks for a changed model (GCS generation or file mtime); 0 disables them.
+MODEL_REFRESH_INTERVAL = float(os.environ.get("MODEL_REFRESH_INTERVAL", 300))
+
+# Requests are scored as arrays laid out in the model's training column order
+# (see ModelState), so sklearn's feature-name check has nothing to compare.
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+
+class ModelState:
+    """A loaded model and the column layout its requests are written into."""
+
+    def __init__(self, model, version, encoder_spec=None):
+        self.model = model
+        self.version = version
+        self.columns = list(model.feature_names_in_)
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+        self.encoder = RawEncoder(encoder_spec, self.columns) if encoder_spec else None
+        self._buffers = threading.local()
+
+    def row(self, payload):
+        """One request as a (1, n_features) float array, reusing this thread's buffer.
+
+        ``payload`` holds either every one-hot feature column or, when an
+        encoder was loaded, the raw hour.csv fields (other keys, e.g. the
+        rest of an hour.csv row, are ignored).
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("Request JSON must be an object/dictionary")
+        buffer = getattr(self._buffers, "row", None)
+        if buffer is None:
+            buffer = self._buffers.row = np.empty((1, len(self.columns)), dtype=np.float64)
+
+        if self.encoder is not None and self.encoder.matches(payload):
+            self.encoder.encode(payload, buffer[0])
+            return buffer
+
+        missing = self.column_index.keys() - payload.keys()
+        unexpected = payload.keys() - self.column_index.keys()
+        if missing or unexpected:
+            raise ValueError(f"Feature mismatch: missing {sorted(missing)}, unexpected {sorted(unexpected)}")
+        for name, value in payload.items():
+            buffer[0, self.column_index[name]] = value
+        return buffer
+
+    def predict(self, payload):
+        return self.model.predict(self.row(payload))
+
 
-def load_model_cloud():
-    """Download model from GCS if configured."""
-    bucket_name = os.environ.get("MODEL_BUCKET", "sid-kubeflow-v1")
-    blob_name = os.environ.get("MODEL_BLOB", "bikeshare-model/artifact/model.joblib")
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(blob_name)
-    blob.download_to_filename("model.joblib")
-    return joblib.load("model.joblib")
+storage_client = None
+state = None
+state_lock = threading.Lock()
+refresh_thread = None
+
+
+def _model_blob(name=MODEL_BLOB):
+    global storage_client
+    if storage_client is None:
+        storage_client = storage.Client()
+    blob = storage_client.bucket(MODEL_BUCKET).get_blob(name)
+    if blob is None:
+        raise FileNotFoundError(f"gs://{MODEL_BUCKET}/{name}")
+    return blob
+
+
+def model_version():
+    """Cheap change marker for the configured model: GCS generation or local mtime."""
+    if USE_GCS_MODEL:
+        return f"gs:{_model_blob().generation}"
+    return f"file:{os.stat(MODEL_PATH).st_mtime_ns}"
+
+
+def _read_model(version):
+    if USE_GCS_MODEL:
+        blob = _model_blob()
+        return joblib.load(io.BytesIO(blob.download_as_bytes())), f"gs:{blob.generation}"
+    return joblib.load(MODEL_PATH), version
+
+
+def _read_encoder_spec():
+    """The encoder saved with the model, or None (raw-field requests are then rejected)."""
+    try:
+        if USE_GCS_MODEL:
+            return json.loads(_model_blob(ENCODER_BLOB).download_as_bytes())
+        return load_encoder(ENCODER_PATH)
+    except FileNotFoundError:
+        app.logger.warning("No encoder artifact found; /predict accepts one-hot features only")
+        return None
+
+
+def refresh_model():
+    """Load the model if it changed since the last load; True when a new one was swapped in."""
+    global state
+    with state_lock:
+        version = model_version()
+        if state is not None and state.version == version:
+            return False
+        model, version = _read_model(version)
+        state = ModelState(model, version, _read_encoder_spec())
+        return True
+
+
+def _refresh_loop():
+    while True:
+        time.sleep(MODEL_REFRESH_INTERVAL)
+        try:
+            if refresh_model():
+                app.logger.info("Loaded model %s", state.version)
+        except Exception:
+            app.logger.exception("Model refresh failed; keeping %s", state.version)
+
+
+def load_model():
+    """The process-wide model state, loaded on first use and refreshed in the background."""
+    global refresh_thread
+    if state is None:
+        refresh_model()
+    if MODEL_REFRESH_INTERVAL > 0 and refresh_thread is None:
+        with state_lock:
+            if refresh_thread is None:
+                refresh_thread = threading.Thread(target=_refresh_loop, name="model-refresh", daemon=True)
+                refresh_thread.start()
+    return state
 
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    # Load model: prefer local file in container, or download from GCS if configured.
-    use_gcs = os.environ.get("USE_GCS_MODEL", "false").lower() == "true"
-    model = load_model_cloud() if use_gcs else load_model()
-    try : 
+    try :
+        model_state = load_model()
         input_json = request.get_json()
-        input_df = pd.DataFrame(input_json, index=[0])
-        y_predictions = model.predict(input_df)
+        y_predictions = model_state.predict(input_json)
         response = {'predictions': y_predictions.tolist()}
         return jsonify(response), 200
-    
+
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
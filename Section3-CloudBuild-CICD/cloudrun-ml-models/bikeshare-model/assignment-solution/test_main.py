@@ -1,6 +1,12 @@
+import json
+import os
+
 import pytest
+import main
 from main import app
 
+HERE = os.path.dirname(os.path.abspath(__file__))
+
 @pytest.fixture
 def client():
     with app.test_client() as client:
@@ -33,4 +39,64 @@ def test_predict_failure(client):
     response = client.post('/predict', json=input_data)
     print(response.status_code)
     print(response.json)
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def trained_model(tmp_path, monkeypatch):
+    """A small model fitted on hour.csv, saved where main loads it from."""
+    from bikeshare import fit_encoder, load_data, preprocess_data, save_encoder
+    from joblib import dump
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.pipeline import make_pipeline
+
+    df = load_data(os.path.join(HERE, "..", "hour.csv"), cache_dir="")
+    encoder = fit_encoder(df)
+    X, y = preprocess_data(df, encoder)
+    path = tmp_path / "model.joblib"
+    dump(make_pipeline(RandomForestRegressor(n_estimators=5, random_state=0)).fit(X, y), path)
+    save_encoder(encoder, str(tmp_path / "encoder.json"))
+
+    monkeypatch.setattr(main, "MODEL_PATH", str(path))
+    monkeypatch.setattr(main, "ENCODER_PATH", str(tmp_path / "encoder.json"))
+    monkeypatch.setattr(main, "MODEL_REFRESH_INTERVAL", 0)
+    monkeypatch.setattr(main, "state", None)
+    return path, X
+
+def test_predict_matches_dataframe_model(client, trained_model):
+    _, X = trained_model
+    payload = {name: float(value) for name, value in X.iloc[7].items()}
+    response = client.post('/predict', json=payload)
+    assert response.status_code == 200
+    expected = main.state.model.predict(X.iloc[[7]])
+    assert response.json["predictions"] == pytest.approx(expected.tolist())
+
+def test_predict_reports_feature_mismatch(client, trained_model):
+    _, X = trained_model
+    payload = {name: 0 for name in X.columns[1:]}
+    payload["windspeed"] = 0.1
+    response = client.post('/predict', json=payload)
+    assert response.status_code == 400
+    assert "missing ['temp']" in response.json["error"] and "unexpected ['windspeed']" in response.json["error"]
+
+def test_predict_accepts_raw_hour_fields(client, trained_model):
+    _, X = trained_model
+    raw = {"season": 3, "mnth": 7, "hr": 17, "holiday": 0, "weekday": 2, "workingday": 1,
+           "weathersit": 1, "temp": 0.7, "hum": 0.5}
+    one_hot = {name: 0 for name in X.columns}
+    one_hot.update({"temp": 0.7, "humidity": 0.5, "season_3": 1, "month_7": 1, "hour_17": 1,
+                    "weekday_2": 1, "workingday_1": 1})
+    response = client.post('/predict', json=raw)
+    assert response.status_code == 200
+    assert response.json == client.post('/predict', json=one_hot).json
+
+    response = client.post('/predict', json={**raw, "hr": 24})
+    assert response.status_code == 400
+    assert "Unknown hr value 24" in response.json["error"]
+
+def test_refresh_model_reloads_only_when_file_changes(trained_model):
+    path, _ = trained_model
+    first = main.load_model()
+    assert main.load_model() is first and not main.refresh_model()
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert main.refresh_model() and main.state is not first
@@ -4,7 +4,8 @@ curl -X POST http://127.0.0.1:5052/predict \
 -d '{"temp":0.24,"humidity":0.81,"season_2":0,"season_3":0,"season_4":0,"month_2":0,"month_3":0,"month_4":0,"month_5":0,"month_6":0,"month_7":0,"month_8":0,"month_9":0,"month_10":0,"month_11":0,"month_12":0,"hour_1":0,"hour_2":0,"hour_3":0,"hour_4":0,"hour_5":0,"hour_6":0,"hour_7":0,"hour_8":0,"hour_9":0,"hour_10":0,"hour_11":0,"hour_12":0,"hour_13":0,"hour_14":0,"hour_15":0,"hour_16":0,"hour_17":0,"hour_18":0,"hour_19":0,"hour_20":0,"hour_21":0,"hour_22":0,"hour_23":0,"holiday_1":0,"weekday_1":0,"weekday_2":0,"weekday_3":0,"weekday_4":0,"weekday_5":0,"weekday_6":1,"workingday_1":0,"weather_2":0,"weather_3":0,"weather_4":0}'
 
 
-docker build -t bike_share_model_inference .
+# Build from the repository root (the image installs libs/bikeshare)
+docker build -t bike_share_model_inference -f Section3-CloudBuild-CICD/cloudrun-ml-models/bikeshare-model/assignment-solution/Dockerfile .
 
 docker tag bike_share_model_inference gcr.io/udemy-mlops/bike_share_model_inference
 
@@ -12,8 +13,8 @@ docker push gcr.io/udemy-mlops/bike_share_model_inference
 
 gcloud run deploy bikeshare-model-inference --image  gcr.io/udemy-mlops/bike_share_model_inference --region us-central1
 
-# Submit your cloudbuild.yaml file 
-gcloud builds submit --region us-central1
+# Submit your cloudbuild.yaml file from the repository root
+gcloud builds submit --region us-central1 --config Section3-CloudBuild-CICD/cloudrun-ml-models/bikeshare-model/cloudbuild.yaml
 
 
 # Test cloud-run app after deployment 
@@ -1,70 +1,22 @@
-import pandas as pd
-import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error
 from google.cloud import storage
-from joblib import dump
-from sklearn.pipeline import make_pipeline
 
-storage_client = storage.Client()
-bucket = storage_client.bucket("sid-kubeflow-v1")
+from bikeshare import fit_encoder, load_data, preprocess_data, rmse, save_model_artifact, train_model
 
-def load_data(filename):
-    df = pd.read_csv(filename)
-    return df
-
-def preprocess_data(df):
-    df = df.rename(columns={'weathersit':'weather',
-                            'yr':'year',
-                            'mnth':'month',
-                            'hr':'hour',
-                            'hum':'humidity',
-                            'cnt':'count'})
-    df = df.drop(columns=['instant', 'dteday', 'year'])
-    cols = ['season', 'month', 'hour', 'holiday', 'weekday', 'workingday', 'weather']
-    for col in cols:
-        df[col] = df[col].astype('category')
-    df['count'] = np.log(df['count'])
-    df_oh = df.copy()
-    for col in cols:
-        df_oh = one_hot_encoding(df_oh, col)
-    X = df_oh.drop(columns=['atemp', 'windspeed', 'casual', 'registered', 'count'], axis=1)
-    y = df_oh['count']
-    return X, y
-
-def one_hot_encoding(data, column):
-    data = pd.concat([data, pd.get_dummies(data[column], prefix=column, drop_first=True)], axis=1)
-    data = data.drop([column], axis=1)
-    return data
-
-def train_model(x_train, y_train):
-    model = RandomForestRegressor()
-    pipeline = make_pipeline(model)
-    pipeline.fit(x_train, y_train)
-    return pipeline
-
-def save_model_artifact(pipeline):
-    artifact_name = 'model.joblib'
-    dump(pipeline, artifact_name)
-        
-    # Uncomment the below 2 lines while running from cloud 
-
-    # model_artifact = bucket.blob('artifact/'+artifact_name)
-    # model_artifact.upload_from_filename(artifact_name)
+def artifact_bucket():
+    return storage.Client().bucket("sid-kubeflow-v1")
 
 def main():
-     # Uncomment the below line while running from cloud 
     filename = 'hour.csv'
     df = load_data(filename)
-    X, y = preprocess_data(df)
-    # model, rmse = train_model(X, y)
+    encoder = fit_encoder(df)
+    X, y = preprocess_data(df, encoder)
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
-    pipeline = train_model(X_train, y_train)
+    pipeline = train_model(X_train, y_train, 'random_forest')
     y_pred = pipeline.predict(X_test)
-    save_model_artifact(pipeline)
-    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-    print('RMSE:', rmse)
+    # Pass bucket=artifact_bucket(), prefix='artifact/' while running from cloud
+    save_model_artifact(pipeline, encoder)
+    print('RMSE:', rmse(y_test, y_pred))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -3,15 +3,28 @@ from flask import Flask, request, jsonify
 from category_encoders import HashingEncoder
 import pickle
 import os
+import threading
+import time
 from google.cloud import storage
 from datetime import datetime
-import logging 
+import atexit
+import json
+import queue
 
 app = Flask(__name__)
 model = None
 
-logging_client = logging.Client()
-logger = logging_client.logger('coupon-classification-predictions-logs')
+LOG_NAME = os.environ.get("LOG_NAME", "coupon-classification-predictions-logs")
+# "cloud" ships to Cloud Logging; "file" appends JSON lines to LOG_FILE instead.
+LOG_SINK = os.environ.get("LOG_SINK", "cloud")
+LOG_FILE = os.environ.get("LOG_FILE", "prediction-logs.jsonl")
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 1000))
+LOG_BATCH_SIZE = int(os.environ.get("LOG_BATCH_SIZE", 50))
+LOG_FLUSH_INTERVAL = float(os.environ.get("LOG_FLUSH_INTERVAL", 2.0))
+# "drop" discards an entry when the queue is full; "block" waits up to
+# LOG_BLOCK_TIMEOUT seconds for room first (and drops if there still is none).
+LOG_QUEUE_POLICY = os.environ.get("LOG_QUEUE_POLICY", "drop")
+LOG_BLOCK_TIMEOUT = float(os.environ.get("LOG_BLOCK_TIMEOUT", 0.05))
 
 
 def preprocess_data(df):
@@ -54,15 +67,203 @@ def encode_features(x, n_components=27):
     x_encoded = hashing_ros_enc.transform(x.reset_index(drop=True))
     return x_encoded
 
+MODEL_BLOB = os.environ.get("MODEL_BLOB", "ml-artifacts/xgboost_coupon_recommendation_hpt.pkl")
+
+class CloudLoggingSink:
+    def __init__(self, name):
+        from google.cloud import logging as cloud_logging
+        self.logger = cloud_logging.Client().logger(name)
+
+    def write(self, entries):
+        # One API call per batch instead of one per prediction.
+        batch = self.logger.batch()
+        for entry in entries:
+            batch.log_struct(entry)
+        batch.commit()
+
+class FileSink:
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, entries):
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+class LogShipper:
+    """Ships prediction log entries from a bounded queue on a background thread.
+
+    ``submit`` never waits on the sink: entries are written in batches of up
+    to ``batch_size``, or whatever has arrived after ``flush_interval``
+    seconds. When the queue is full an entry is dropped (after waiting up to
+    ``block_timeout`` with the "block" policy) and counted in ``dropped``.
+    """
+
+    def __init__(self, sink, maxsize=1000, batch_size=50, flush_interval=2.0, policy="drop", block_timeout=0.05):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown log queue policy: {policy!r}")
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.failed = 0
+        # Guards the counters: submit() runs on every request thread.
+        self._counter_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-shipper", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry):
+        try:
+            if self.policy == "block":
+                self.queue.put(entry, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+
+    def _next_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            self.sink.write(batch)
+        except Exception:
+            with self._counter_lock:
+                self.failed += len(batch)
+            app.logger.exception("Dropped %s prediction log entries", len(batch))
+
+    def _run(self):
+        while not self._closed.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+        self._drain()
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) == self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def close(self, timeout=5.0):
+        """Stop the thread after writing whatever is still queued."""
+        self._closed.set()
+        self._thread.join(timeout)
+
+log_shipper = None
+log_shipper_lock = threading.Lock()
+
+def get_log_shipper():
+    global log_shipper
+    if log_shipper is None:
+        with log_shipper_lock:
+            if log_shipper is None:
+                sink = FileSink(LOG_FILE) if LOG_SINK == "file" else CloudLoggingSink(LOG_NAME)
+                log_shipper = LogShipper(sink, maxsize=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                                         flush_interval=LOG_FLUSH_INTERVAL, policy=LOG_QUEUE_POLICY,
+                                         block_timeout=LOG_BLOCK_TIMEOUT)
+                atexit.register(log_shipper.close)
+    return log_shipper
+
+# Model loading. This block is kept identical in coupon-recommendations/main.py
+# and coupon-recommendations-hpt/main.py (only MODEL_BLOB, above, differs);
+# change both together.
+MODEL_BUCKET = os.environ.get("MODEL_BUCKET", "sid-ml-ops")
+# Seconds between checks for a new model generation in GCS; 0 disables them.
+MODEL_REFRESH_INTERVAL = float(os.environ.get("MODEL_REFRESH_INTERVAL", 300))
+# Seconds between load attempts until the first load succeeds.
+MODEL_RETRY_INTERVAL = float(os.environ.get("MODEL_RETRY_INTERVAL", 10))
+
+storage_client = None
+model_generation = None
+model_lock = threading.Lock()
+refresh_thread = None
+
+class ModelNotReady(RuntimeError):
+    pass
+
+def _model_blob():
+    global storage_client
+    if storage_client is None:
+        storage_client = storage.Client()
+    blob = storage_client.bucket(MODEL_BUCKET).get_blob(MODEL_BLOB)
+    if blob is None:
+        raise FileNotFoundError(f"gs://{MODEL_BUCKET}/{MODEL_BLOB}")
+    return blob
+
+def refresh_model():
+    """Load the model if its GCS generation changed since the last load.
+
+    The pickle is downloaded into memory (the blob carries its generation, so
+    the bytes match it) and swapped in whole; nothing is written to disk.
+    """
+    global model, model_generation
+    with model_lock:
+        blob = _model_blob()
+        if blob.generation == model_generation:
+            return False
+        model = pickle.loads(blob.download_as_bytes())
+        model_generation = blob.generation
+        return True
+
+def _refresh_loop():
+    while True:
+        time.sleep(MODEL_RETRY_INTERVAL if model is None else MODEL_REFRESH_INTERVAL)
+        try:
+            if refresh_model():
+                app.logger.info("Loaded model generation %s", model_generation)
+        except Exception:
+            app.logger.exception("Model refresh failed; keeping generation %s", model_generation)
+        if model is not None and MODEL_REFRESH_INTERVAL <= 0:
+            return
+
+def start_model_loading():
+    """Load the model and start the background refresh thread.
+
+    A failed first load is logged instead of failing the import (and with it
+    the gunicorn worker); the thread keeps retrying until it succeeds.
+    """
+    global refresh_thread
+    try:
+        refresh_model()
+        app.logger.info("Loaded model generation %s", model_generation)
+    except Exception:
+        app.logger.exception("Initial model load failed; retrying every %ss", MODEL_RETRY_INTERVAL)
+    if model is None or MODEL_REFRESH_INTERVAL > 0:
+        refresh_thread = threading.Thread(target=_refresh_loop, name="model-refresh", daemon=True)
+        refresh_thread.start()
+
 def load_model():
-    storage_client = storage.Client()
-    bucket_name = "sid-ml-ops"
-    bucket = storage_client.get_bucket(bucket_name)
-    blob = bucket.blob("ml-artifacts/xgboost_coupon_recommendation_hpt.pkl")
-    blob.download_to_filename("xgboost_coupon_recommendation_hpt.pkl")
-    model = pickle.load(open("xgboost_coupon_recommendation_hpt.pkl", "rb"))
+    """The process-wide model. Only the refresh thread talks to GCS, never a request."""
+    if model is None:
+        raise ModelNotReady("Model is not loaded yet")
     return model
 
+start_model_loading()
+
 def preprocess(input_json):
     try:
         df = pd.DataFrame(input_json, index=[0])
@@ -76,20 +277,22 @@ def preprocess(input_json):
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    model = load_model()
     try : 
         input_json = request.get_json()
         df_preprocessed = preprocess(input_json)
+        model = load_model()
         y_predictions = model.predict(df_preprocessed)
         response = {'predictions': y_predictions.tolist()}
-        logger.log_struct({
+        get_log_shipper().submit({
             'keyword': 'coupon_model_logs',
             'execution_timestamp': datetime.now().isoformat(),
             'input_payload':input_json,
-            'predicted_output':y_predictions
+            'predicted_output':response['predictions']
         })
         return jsonify(response), 200
 
+    except ModelNotReady as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -100,6 +303,8 @@ def healthz():
 
 @app.route("/readyz", methods=["GET"])
 def readyz():
+    if model is None:
+        return {"status": "model not loaded"}, 503
     return {"status": "ready"}, 200
 
 if __name__ == '__main__':
@@ -1,4 +1,11 @@
+import json
+import pickle
+from types import SimpleNamespace
+import threading
+
 import pytest
+
+import main
 from main import app, preprocess
 
 @pytest.fixture
@@ -7,6 +14,7 @@ def client():
         yield client
 
 def test_predict(client):
+    main.refresh_model()
     input_data = {
         "destination": "No Urgent Place",
         "passanger": "Kid(s)",
@@ -38,6 +46,7 @@ def test_predict(client):
     assert response.json["predictions"][0] in [0, 1]
 
 def test_predict_failure(client):
+    main.refresh_model()
     input_data = {
         "destination": ["No Urgent Place"],
         "passanger": ["Kid(s)"],
@@ -86,4 +95,60 @@ def test_preprocess():
         "direction_same": [0]
     }
     df = preprocess(input_data)
-    assert len(df.columns) == 39
\ No newline at end of file
+    assert len(df.columns) == 39
+
+
+def test_refresh_model_reloads_only_on_new_generation(monkeypatch):
+    downloads = []
+    blob = SimpleNamespace(generation=1)
+    blob.download_as_bytes = lambda: downloads.append(blob.generation) or pickle.dumps(f"model-v{blob.generation}")
+    monkeypatch.setattr(main, "_model_blob", lambda: blob)
+    monkeypatch.setattr(main, "model", None)
+    monkeypatch.setattr(main, "model_generation", None)
+
+    assert main.refresh_model()
+    assert not main.refresh_model()
+    assert main.model == "model-v1" and downloads == [1]
+
+    blob.generation = 2
+    assert main.refresh_model()
+    assert main.model == "model-v2" and downloads == [1, 2]
+
+def test_unloaded_model_returns_503(client, monkeypatch):
+    monkeypatch.setattr(main, "model", None)
+    monkeypatch.setattr(main, "preprocess", lambda input_json: input_json)
+    response = client.post("/predict", json={"destination": "No Urgent Place"})
+    assert response.status_code == 503
+    assert "error" in response.get_json()
+    assert client.get("/readyz").status_code == 503
+
+def test_log_shipper_writes_batches_to_file(tmp_path):
+    path = tmp_path / "logs.jsonl"
+    shipper = main.LogShipper(main.FileSink(str(path)), batch_size=2, flush_interval=0.05)
+    for i in range(5):
+        assert shipper.submit({"i": i})
+    shipper.close()
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["i"] for line in lines] == [0, 1, 2, 3, 4]
+
+def test_log_shipper_drops_when_queue_is_full():
+    release = threading.Event()
+
+    class StuckSink:
+        def write(self, entries):
+            release.wait()
+
+    shipper = main.LogShipper(StuckSink(), maxsize=2, batch_size=1, flush_interval=0.01)
+    results = []
+
+    def submit_many():
+        results.extend(shipper.submit({"i": i}) for i in range(500))
+
+    threads = [threading.Thread(target=submit_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not all(results) and shipper.dropped == results.count(False)
+    release.set()
+    shipper.close()
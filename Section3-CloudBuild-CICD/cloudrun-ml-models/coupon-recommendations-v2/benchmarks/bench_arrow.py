@@ -0,0 +1,61 @@
+"""Bulk scoring through the Flask app: JSON /predict:batch vs Arrow stream and Parquet /predict.
+
+Rows come from the training CSV, repeated up to ``--rows``, so the columns
+have realistic cardinality. Times cover the whole request: decoding,
+features, ``model.predict`` and encoding the response.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from coupon_reco.app import create_app
+from coupon_reco.inference.arrow import ARROW_STREAM_MIMETYPE
+from coupon_reco.inference.features import REQUEST_FIELDS
+
+TRAINING_CSV = Path(__file__).resolve().parents[1] / "training" / "data" / "in-vehicle-coupon-recommendation.csv"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    raw = pd.read_csv(TRAINING_CSV)[REQUEST_FIELDS].dropna()
+    frame = pd.concat([raw] * (args.rows // len(raw) + 1), ignore_index=True).iloc[: args.rows]
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    parquet = io.BytesIO()
+    pq.write_table(table, parquet)
+
+    client = create_app().test_client()
+    cases = {
+        "JSON /predict:batch": ("/predict:batch", json.dumps(frame.to_dict("records")), "application/json"),
+        "Arrow /predict": ("/predict", sink.getvalue().to_pybytes(), ARROW_STREAM_MIMETYPE),
+        "Parquet /predict": ("/predict", parquet.getvalue(), "application/vnd.apache.parquet"),
+    }
+    print(f"{'format':<22} {'request MB':>10} {'response MB':>11} {'best s':>8} {'rows/s':>10}")
+    for name, (path, body, mimetype) in cases.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.post(path, data=body, content_type=mimetype).get_data()
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{name:<22} {len(body) / 1e6:>10.2f} {len(response) / 1e6:>11.2f} {best:>8.3f} {args.rows / best:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Rows/second through the Flask app: N single /predict calls vs one /predict:batch call."""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from common import SAMPLE_PAYLOAD
+
+from coupon_reco.app import create_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    client = create_app().test_client()
+    client.post("/predict", json=SAMPLE_PAYLOAD)  # load the model
+
+    start = time.perf_counter()
+    for _ in range(args.rows):
+        client.post("/predict", json=SAMPLE_PAYLOAD)
+    single = time.perf_counter() - start
+
+    records = [SAMPLE_PAYLOAD] * args.rows
+    start = time.perf_counter()
+    client.post("/predict:batch", json=records).get_data()
+    batch_json = time.perf_counter() - start
+
+    body = "\n".join(json.dumps(r) for r in records)
+    start = time.perf_counter()
+    client.post("/predict:batch", data=body, content_type="application/x-ndjson").get_data()
+    batch_ndjson = time.perf_counter() - start
+
+    for name, elapsed in [("single /predict", single), ("batch JSON", batch_json), ("batch NDJSON", batch_ndjson)]:
+        print(f"{name:<16} {elapsed:8.3f} s  {args.rows / elapsed:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""/predict latency through the Flask test client: cache hits vs misses."""
+from __future__ import annotations
+
+import os
+
+# The cache is opt-in; turn it on unless the caller picked a size.
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "4096")
+
+import argparse  # noqa: E402
+import itertools  # noqa: E402
+
+from common import SAMPLE_PAYLOAD, print_table, time_calls  # noqa: E402
+
+from coupon_reco.app import create_app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    client = create_app().test_client()
+    temperatures = itertools.count()
+
+    def miss():
+        # A never-seen temperature makes every payload a new cache key.
+        client.post("/predict", json={**SAMPLE_PAYLOAD, "temperature": next(temperatures)})
+
+    print_table(
+        {
+            "/predict cache miss": time_calls(miss, args.n),
+            "/predict cache hit": time_calls(lambda: client.post("/predict", json=SAMPLE_PAYLOAD), args.n),
+        }
+    )
+    print("cache stats:", client.get("/statsz").json["cache"])
+
+
+if __name__ == "__main__":
+    main()
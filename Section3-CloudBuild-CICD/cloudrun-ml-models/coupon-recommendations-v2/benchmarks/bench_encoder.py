@@ -0,0 +1,47 @@
+"""Per-request encoding latency: refitting HashingEncoder vs the fitted artifact.
+
+``refit`` reproduces the old behaviour (a new encoder per request, default
+``max_process``); ``refit_4proc`` pins the pool size a 8-vCPU host would pick;
+``fitted`` is the transform-only path used by the service now.
+"""
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+from category_encoders import HashingEncoder
+from common import SAMPLE_PAYLOAD, print_table, time_calls
+
+from coupon_reco.inference.features import (
+    HASHED_COLUMNS,
+    N_COMPONENTS,
+    encode_features,
+    fit_template_encoder,
+    preprocess_data,
+    preprocess_request,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=500)
+    args = parser.parse_args()
+
+    x = preprocess_data(pd.DataFrame(SAMPLE_PAYLOAD, index=[0]))
+    encoder = fit_template_encoder()
+
+    def refit(max_process: int = 0):
+        enc = HashingEncoder(cols=HASHED_COLUMNS, n_components=N_COMPONENTS, max_process=max_process).fit(x)
+        return enc.transform(x.reset_index(drop=True))
+
+    results = {
+        "encode: refit": time_calls(refit, args.n),
+        "encode: refit_4proc": time_calls(lambda: refit(4), max(args.n // 10, 10)),
+        "encode: fitted": time_calls(lambda: encode_features(x, encoder=encoder), args.n),
+        "preprocess_request: fitted": time_calls(lambda: preprocess_request(SAMPLE_PAYLOAD, encoder), args.n),
+    }
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
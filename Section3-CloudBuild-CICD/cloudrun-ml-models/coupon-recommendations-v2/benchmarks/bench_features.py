@@ -0,0 +1,31 @@
+"""Single-request feature building: pandas path vs the compiled FeaturePlan, with and without a bucket table."""
+from __future__ import annotations
+
+import argparse
+
+from common import SAMPLE_PAYLOAD, print_table, time_calls
+
+from coupon_reco.inference.features import fit_template_encoder, preprocess_request
+from coupon_reco.inference.plan import FeaturePlan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    encoder = fit_template_encoder()
+    plan = FeaturePlan.from_encoder(encoder)
+    lookup = FeaturePlan.from_encoder(encoder, buckets=plan.build_bucket_table([SAMPLE_PAYLOAD]))
+
+    print_table(
+        {
+            "preprocess_request (pandas)": time_calls(lambda: preprocess_request(SAMPLE_PAYLOAD, encoder), args.n),
+            "FeaturePlan.transform_one": time_calls(lambda: plan.transform_one(SAMPLE_PAYLOAD), args.n),
+            "  + bucket table": time_calls(lambda: lookup.transform_one(SAMPLE_PAYLOAD), args.n),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Throughput of concurrent single-row predictions with and without the micro-batcher.
+
+Mirrors gunicorn's ``--threads 8``: each thread builds features with the plan
+and either calls ``model.predict`` itself or goes through ``MicroBatcher``.
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from common import SAMPLE_PAYLOAD, percentile
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.batcher import MicroBatcher
+from coupon_reco.inference.predictor import load_model, predict
+
+
+def run(threads: int, per_thread: int, score) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            score()
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="per thread")
+    parser.add_argument("--max-rows", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    bundle = load_model(Settings())
+    batcher = MicroBatcher(predict, args.max_rows, args.max_wait_ms)
+
+    cases = {
+        "direct": lambda: predict(bundle, bundle.plan.transform_one(SAMPLE_PAYLOAD)),
+        "micro-batched": lambda: batcher.predict(bundle, bundle.plan.transform_one(SAMPLE_PAYLOAD)),
+    }
+    total = args.threads * args.requests
+    for name, score in cases.items():
+        elapsed, lat = run(args.threads, args.requests, score)
+        print(
+            f"{name:<14} {total / elapsed:8.0f} req/s  p50 {percentile(lat, 50):6.2f} ms  "
+            f"p99 {percentile(lat, 99):6.2f} ms"
+        )
+    print("batcher stats:", batcher.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Load time and predict latency for the pickled XGBClassifier vs native XGBoost formats.
+
+The native artifacts are exported from the local pickle into a temporary
+directory, so every format holds the same trees.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+from common import SAMPLE_PAYLOAD, percentile, time_calls
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.predictor import _deserialize_model, load_model
+
+FORMATS = [".pkl", ".bst", ".json", ".ubj"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000)
+    parser.add_argument("--loads", type=int, default=20)
+    args = parser.parse_args()
+
+    settings = Settings()
+    bundle = load_model(settings)
+    one_row = bundle.plan.transform_one(SAMPLE_PAYLOAD)
+    many_rows = np.repeat(one_row, 1000, axis=0)
+
+    with tempfile.TemporaryDirectory() as td:
+        paths = {}
+        for suffix in FORMATS:
+            path = os.path.join(td, f"model{suffix}")
+            if suffix == ".pkl":
+                with open(path, "wb") as f:
+                    pickle.dump(bundle.model, f)
+            else:
+                bundle.model.get_booster().save_model(path)
+            paths[suffix] = path
+
+        print(f"{'format':<6} {'size KB':>8} {'load p50 ms':>12} {'1 row p50 ms':>13} {'1 row p99 ms':>13} {'1000 rows ms':>13}")
+        for suffix, path in paths.items():
+            with open(path, "rb") as f:
+                raw = f.read()
+            loads = []
+            for _ in range(args.loads):
+                start = time.perf_counter()
+                model = _deserialize_model(raw, path)
+                loads.append((time.perf_counter() - start) * 1000)
+            single = time_calls(lambda: model.predict(one_row), args.n)
+            batch = time_calls(lambda: model.predict(many_rows), max(args.n // 20, 10))
+            print(
+                f"{suffix:<6} {len(raw) / 1024:8.0f} {percentile(loads, 50):12.2f} {single['p50_ms']:13.3f} "
+                f"{single['p99_ms']:13.3f} {batch['p50_ms']:13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
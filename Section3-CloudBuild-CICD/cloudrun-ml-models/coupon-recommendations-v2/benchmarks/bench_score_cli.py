@@ -0,0 +1,75 @@
+"""``coupon-reco score`` on the training CSV replicated ``--copies`` times.
+
+Each configuration runs in a fresh process; peak RSS is that process's (and
+its pool workers') ``ru_maxrss``. The reference row loads the whole file with
+pandas and runs ``preprocess_data`` + encoder + model in one go. The startup
+row (imports only) is a fixed cost included in every other row.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TRAINING_CSV = ROOT / "training" / "data" / "in-vehicle-coupon-recommendation.csv"
+
+REFERENCE = """
+import sys
+import pandas as pd
+from coupon_reco.config import Settings
+from coupon_reco.inference.features import REQUEST_FIELDS, encode_features, preprocess_data
+from coupon_reco.inference.predictor import load_model
+bundle = load_model(Settings())
+frame = encode_features(preprocess_data(pd.read_csv(sys.argv[1])[REQUEST_FIELDS]), encoder=bundle.encoder)
+bundle.model.predict(frame.fillna(0).to_numpy())
+"""
+
+
+def run(cmd: list[str]) -> tuple[float, float]:
+    """Wall time in seconds and peak RSS in MiB of ``cmd``."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, "LOG_LEVEL": "WARNING"})
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"{cmd} failed")
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[10_000, 50_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "input.csv"
+        header, *lines = TRAINING_CSV.read_text().splitlines(keepends=True)
+        source.write_text(header + "".join(lines * args.copies))
+        rows = len(lines) * args.copies
+        print(f"input: {rows} rows, {source.stat().st_size / 1e6:.1f} MB, cpus: {os.cpu_count()}")
+        print(f"{'run':<28} {'seconds':>8} {'rows/s':>9} {'peak RSS MiB':>13}")
+
+        elapsed, rss = run([sys.executable, "-c", "import coupon_reco.cli"])
+        print(f"{'startup (imports only)':<28} {elapsed:>8.2f} {'':>9} {rss:>13.0f}")
+        elapsed, rss = run([sys.executable, "-c", REFERENCE, str(source)])
+        print(f"{'pandas whole file':<28} {elapsed:>8.2f} {rows / elapsed:>9.0f} {rss:>13.0f}")
+        for chunk_size in args.chunk_size:
+            for workers in args.workers:
+                cmd = [
+                    sys.executable, "-m", "coupon_reco.cli", "score", str(source), str(Path(tmp) / "out.csv"),
+                    "--chunk-size", str(chunk_size), "--workers", str(workers),
+                ]
+                elapsed, rss = run(cmd)
+                name = f"cli chunk={chunk_size} w={workers}"
+                print(f"{name:<28} {elapsed:>8.2f} {rows / elapsed:>9.0f} {rss:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Cost of request schema validation, and of rejecting a malformed /predict request."""
+from __future__ import annotations
+
+import argparse
+import logging
+
+from common import SAMPLE_PAYLOAD, print_table, time_calls
+
+from coupon_reco.app import create_app
+from coupon_reco.inference.plan import FeaturePlan
+from coupon_reco.inference.schema import SchemaError, validate_request
+
+BAD_SHAPE = {"destination": ["No Urgent Place"], "passanger": ["Kid(s)"]}
+
+
+def rejects(payload) -> None:
+    try:
+        validate_request(payload)
+    except SchemaError:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    plan = FeaturePlan()
+    client = create_app().test_client()
+    client.post("/predict", json=SAMPLE_PAYLOAD)  # load the model
+
+    print_table(
+        {
+            "validate_request (valid)": time_calls(lambda: validate_request(SAMPLE_PAYLOAD), args.n),
+            "validate_request (bad shape)": time_calls(lambda: rejects(BAD_SHAPE), args.n),
+            "FeaturePlan.transform_one": time_calls(lambda: plan.transform_one(SAMPLE_PAYLOAD), args.n),
+            "/predict (valid)": time_calls(lambda: client.post("/predict", json=SAMPLE_PAYLOAD), args.n // 5),
+            "/predict (bad shape)": time_calls(lambda: client.post("/predict", json=BAD_SHAPE), args.n // 5),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
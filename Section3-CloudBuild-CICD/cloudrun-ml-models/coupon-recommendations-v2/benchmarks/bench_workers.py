@@ -0,0 +1,87 @@
+"""Throughput and memory as gunicorn goes from 1 to N workers, with and without preload.
+
+For each worker count the server is started through gunicorn.conf.py, driven
+with ``--concurrency`` keep-alive clients (see load_test.py), and the memory of
+the master plus its workers is read from /proc: RSS counts shared pages once
+per process, PSS splits them between the processes sharing them, so PSS is
+what the container actually uses. Linux only.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from common import percentile
+from load_test import drive, wait_ready
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{tid}/children") as f:
+            pids += [child for c in f.read().split() for child in process_tree(int(c))]
+    return pids
+
+
+def memory_mib(pids: list[int]) -> tuple[float, float]:
+    """Summed (RSS, PSS) of ``pids`` in MiB."""
+    rss = pss = 0
+    for pid in pids:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "Rss":
+                    rss += int(value.split()[0])
+                elif key == "Pss":
+                    pss += int(value.split()[0])
+    return rss / 1024, pss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'preload':<8} {'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'RSS MiB':>8} {'PSS MiB':>8}")
+    for preload in (False, True):
+        for workers in args.workers:
+            env = {
+                **os.environ,
+                "PORT": str(args.port),
+                "GUNICORN_WORKERS": str(workers),
+                "GUNICORN_PRELOAD": str(preload).lower(),
+                "PRELOAD_MODEL": "true",
+                "PREDICTION_CACHE_SIZE": "0",
+                "METRICS_ENABLED": "false",
+                "LOG_LEVEL": "WARNING",
+            }
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "coupon_reco.app:app"],
+                cwd=ROOT,
+                env=env,
+            )
+            try:
+                wait_ready(args.port)
+                drive(args.port, args.concurrency, 1.0)  # make sure every worker has loaded the model
+                count, _, lat = drive(args.port, args.concurrency, args.duration)
+                rss, pss = memory_mib(process_tree(proc.pid))
+                print(
+                    f"{str(preload):<8} {workers:>7} {count / args.duration:>8.0f} {percentile(lat, 50):>8.2f} "
+                    f"{percentile(lat, 99):>8.2f} {rss:>8.1f} {pss:>8.1f}"
+                )
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Shared helpers for the standalone benchmark scripts.
+
+Run benchmarks from the project root with the package installed, e.g.
+``python benchmarks/bench_encoder.py``. They use the local artifacts only.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable
+
+# The request body the tests use, so benchmarks and tests score the same payload.
+from coupon_reco.testing import SAMPLE_PAYLOAD  # noqa: F401
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def time_calls(fn: Callable[[], Any], n: int = 1000, warmup: int = 20) -> dict[str, float]:
+    """Call ``fn`` ``n`` times and summarize latency in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+    }
+
+
+def measure_allocations(fn: Callable[[], Any], n: int = 100) -> dict[str, float]:
+    """Mean peak traced memory (KiB) and net allocated blocks per call of ``fn``."""
+    fn()
+    tracemalloc.start()
+    try:
+        peaks = []
+        blocks_before = len(tracemalloc.take_snapshot().traces)
+        for _ in range(n):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        blocks_after = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib": statistics.fmean(peaks) / 1024, "retained_blocks": (blocks_after - blocks_before) / n}
+
+
+def print_table(results: dict[str, dict[str, float]]) -> None:
+    """Print ``{name: time_calls(...)}`` as an aligned table."""
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'mean':>9}  {'p50':>9}  {'p95':>9}  {'p99':>9}  (ms)")
+    for name, stats in results.items():
+        print(
+            f"{name:<{width}}  {stats['mean_ms']:9.3f}  {stats['p50_ms']:9.3f}  "
+            f"{stats['p95_ms']:9.3f}  {stats['p99_ms']:9.3f}"
+        )
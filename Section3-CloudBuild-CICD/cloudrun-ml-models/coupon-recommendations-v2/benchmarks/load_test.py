@@ -0,0 +1,110 @@
+"""Load test: Flask under gunicorn threads vs the ASGI app under uvicorn.
+
+Starts each server as a subprocess on a local port, waits for /readyz, then
+drives /predict from ``--concurrency`` keep-alive client threads for
+``--duration`` seconds and reports throughput, latency percentiles and
+non-200 responses. The prediction cache is disabled so every request runs
+the model.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from common import SAMPLE_PAYLOAD, percentile
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SERVERS = {
+    "flask+gunicorn": [
+        sys.executable, "-m", "gunicorn", "--bind", "127.0.0.1:{port}",
+        "--workers", "1", "--threads", "8", "--timeout", "0", "coupon_reco.app:app",
+    ],
+    "asgi+uvicorn": [
+        sys.executable, "-m", "uvicorn", "--host", "127.0.0.1", "--port", "{port}",
+        "--log-level", "warning", "--no-access-log", "coupon_reco.asgi:app",
+    ],
+}
+
+
+def wait_ready(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/readyz")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not become ready")
+
+
+def drive(port: int, concurrency: int, duration: float) -> tuple[int, int, list[float]]:
+    body = json.dumps(SAMPLE_PAYLOAD)
+    headers = {"Content-Type": "application/json"}
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        nonlocal errors
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, failed = [], 0
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            conn.request("POST", "/predict", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            local.append((time.perf_counter() - start) * 1000)
+            failed += response.status != 200
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(latencies), errors, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--server", choices=sorted(SERVERS), nargs="+", default=list(SERVERS))
+    args = parser.parse_args()
+
+    env = {**os.environ, "PREDICTION_CACHE_SIZE": "0", "METRICS_ENABLED": "false", "LOG_LEVEL": "WARNING"}
+    print(f"{'server':<16} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'non-200':>8}")
+    for name in args.server:
+        cmd = [part.format(port=args.port) for part in SERVERS[name]]
+        proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+        try:
+            wait_ready(args.port)
+            drive(args.port, 1, 1.0)  # warm up connections and the model
+            for concurrency in args.concurrency:
+                count, errors, lat = drive(args.port, concurrency, args.duration)
+                print(
+                    f"{name:<16} {concurrency:>4} {count / args.duration:>8.0f} "
+                    f"{percentile(lat, 50):>8.2f} {percentile(lat, 99):>8.2f} {errors:>8}"
+                )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Per-stage latency and allocation profile of the /predict hot path.
+
+Each stage of a request is timed on its own against the local artifacts
+(no GCP access needed), plus the full request through the Flask test
+client:
+
+    json_parse       request.get_json on the raw body
+    preprocess_data  one-row DataFrame + preprocess_data (reference path)
+    encode_features  fitted HashingEncoder.transform (reference path)
+    feature_plan     FeaturePlan.transform_one (serving path)
+    model_predict    predict() on the one-row feature matrix
+    jsonify          building the JSON response
+    end_to_end       POST /predict (prediction cache disabled)
+
+Save a baseline and compare later runs against it:
+
+    python benchmarks/run_latency.py --save benchmarks/baseline.json
+    python benchmarks/run_latency.py --compare benchmarks/baseline.json
+"""
+from __future__ import annotations
+
+import os
+
+# Every end_to_end call must do the full work, not hit the prediction cache.
+os.environ["PREDICTION_CACHE_SIZE"] = "0"
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+
+import pandas as pd  # noqa: E402
+from common import SAMPLE_PAYLOAD, measure_allocations, time_calls  # noqa: E402
+from flask import jsonify, request  # noqa: E402
+
+from coupon_reco.app import create_app  # noqa: E402
+from coupon_reco.config import Settings  # noqa: E402
+from coupon_reco.inference.features import encode_features, preprocess_data  # noqa: E402
+from coupon_reco.inference.predictor import load_model, predict  # noqa: E402
+
+
+def build_stages() -> dict:
+    app = create_app(preload=False)
+    client = app.test_client()
+    bundle = load_model(Settings())
+    body = json.dumps(SAMPLE_PAYLOAD)
+    frame = preprocess_data(pd.DataFrame(SAMPLE_PAYLOAD, index=[0]))
+    features = bundle.plan.transform_one(SAMPLE_PAYLOAD)
+    preds = predict(bundle, features)
+
+    def json_parse():
+        with app.test_request_context("/predict", method="POST", data=body, content_type="application/json"):
+            request.get_json(force=True)
+
+    def json_response():
+        with app.app_context():
+            jsonify({"predictions": preds})
+
+    return {
+        "json_parse": json_parse,
+        "preprocess_data": lambda: preprocess_data(pd.DataFrame(SAMPLE_PAYLOAD, index=[0])),
+        "encode_features": lambda: encode_features(frame, encoder=bundle.encoder),
+        "feature_plan": lambda: bundle.plan.transform_one(SAMPLE_PAYLOAD),
+        "model_predict": lambda: predict(bundle, features),
+        "jsonify": json_response,
+        "end_to_end": lambda: client.post("/predict", data=body, content_type="application/json"),
+    }
+
+
+def run(n: int, alloc_n: int) -> dict:
+    results = {}
+    for name, fn in build_stages().items():
+        results[name] = {**time_calls(fn, n), **measure_allocations(fn, alloc_n)}
+    return results
+
+
+def print_results(results: dict, baseline: dict | None = None) -> None:
+    header = f"{'stage':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9} {'blocks':>7}"
+    if baseline:
+        header += f" {'p50 vs base':>12} {'p99 vs base':>12}"
+    print(header)
+    for name, r in results.items():
+        line = (
+            f"{name:<16} {r['p50_ms']:9.3f} {r['p95_ms']:9.3f} {r['p99_ms']:9.3f} "
+            f"{r['peak_kib']:9.1f} {r['retained_blocks']:7.1f}"
+        )
+        base = (baseline or {}).get(name)
+        if base:
+            line += f" {_change(r['p50_ms'], base['p50_ms']):>12} {_change(r['p99_ms'], base['p99_ms']):>12}"
+        print(line)
+
+
+def _change(value: float, base: float) -> str:
+    return f"{(value - base) / base * 100:+.1f}%" if base else "n/a"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=1000, help="timed calls per stage")
+    parser.add_argument("--alloc-n", type=int, default=100, help="traced calls per stage")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    results = run(args.n, args.alloc_n)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["stages"]
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "n": args.n, "stages": results}, f, indent=2)
+            f.write("\n")
+        print(f"Saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Gunicorn settings, driven by coupon_reco.config.Settings.
+
+Picked up automatically when gunicorn starts in this directory. With
+``GUNICORN_PRELOAD=true`` the app (and the model) is loaded once in the
+master and shared copy-on-write by ``GUNICORN_WORKERS`` forked workers.
+"""
+import multiprocessing
+
+from coupon_reco.config import Settings
+
+settings = Settings()
+
+bind = f":{settings.PORT}"
+workers = settings.GUNICORN_WORKERS or multiprocessing.cpu_count()
+threads = settings.GUNICORN_THREADS
+timeout = 0
+preload_app = settings.GUNICORN_PRELOAD
+
+
+def on_starting(server):
+    # Runs in the master after preload_app imported the app, before forking.
+    if server.cfg.preload_app:
+        from coupon_reco.app import app, prepare_fork
+
+        prepare_fork(app)
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from coupon_reco.app import app, restart_after_fork
+
+        restart_after_fork(app)
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import json
 import logging
-from flask import Blueprint, jsonify, request
+from typing import Any, Iterator
 
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from coupon_reco import metrics
 from coupon_reco.config import Settings
-from coupon_reco.inference.features import preprocess_request
-from coupon_reco.inference.predictor import load_model, predict
+from coupon_reco.inference.arrow import ARROW_STREAM_MIMETYPE, COLUMNAR_MIMETYPES, score_columnar
+from coupon_reco.inference.batch import score_records
+from coupon_reco.inference.batcher import Overloaded, get_batcher
+from coupon_reco.inference.cache import get_prediction_cache
+from coupon_reco.inference.predictor import load_model
+from coupon_reco.inference.schema import SchemaError
+from coupon_reco.inference.serving import parse_top_k, predict_payload, rank_payload
 
 logger = logging.getLogger(__name__)
 
 bp = Blueprint("api", __name__)
 
+NDJSON_MIMETYPES = {"application/x-ndjson", "application/jsonl"}
+
 
 @bp.get("/healthz")
 def healthz():
@@ -19,7 +30,10 @@ def healthz():
 
 @bp.get("/readyz")
 def readyz():
-    """Readiness: ensure model can be loaded."""
+    """Readiness: ensure model can be loaded (and warm-up, if enabled, has finished)."""
+    warmup = current_app.extensions.get("warmup")
+    if warmup is not None and not warmup.done.is_set():
+        return jsonify({"status": "warming_up"}), 503
     try:
         _ = load_model(Settings())
         return jsonify({"status": "ready"}), 200
@@ -28,14 +42,107 @@ def readyz():
         return jsonify({"status": "not_ready", "error": str(e)}), 500
 
 
+@bp.get("/statsz")
+def statsz():
+    """In-process serving counters."""
+    settings = Settings()
+    stats = {}
+    watcher = current_app.extensions.get("model_watcher")
+    if watcher is not None:
+        bundle = load_model(settings)
+        stats["model"] = {"version": bundle.version, "generation": bundle.generation, **watcher.stats()}
+    if settings.BATCHING_ENABLED:
+        stats["batcher"] = get_batcher(settings).stats()
+    cache = get_prediction_cache(settings)
+    if cache is not None:
+        stats["cache"] = cache.stats()
+    return jsonify(stats), 200
+
+
+@bp.get("/metrics")
+def metrics_route():
+    """Prometheus scrape endpoint (404 when METRICS_ENABLED is off)."""
+    if not metrics.enabled():
+        return jsonify({"error": "metrics are disabled"}), 404
+    return Response(metrics.render(), mimetype=metrics.CONTENT_TYPE)
+
+
+def _overloaded():
+    return jsonify({"error": "overloaded"}), 503, {"Retry-After": "1"}
+
+
+def _invalid_request(e: SchemaError):
+    # Expected client error: no traceback, so rejecting bad traffic stays cheap.
+    logger.debug("Rejected request: %s", e)
+    return jsonify({"error": str(e), "fields": e.errors}), 400
+
+
 @bp.post("/predict")
 def predict_route():
+    """Score one JSON request, or an Arrow stream / Parquet table of requests."""
     try:
+        if request.mimetype in COLUMNAR_MIMETYPES:
+            body = score_columnar(load_model(Settings()), request.get_data(), request.mimetype)
+            return Response(body, mimetype=ARROW_STREAM_MIMETYPE)
         payload = request.get_json(force=True, silent=False)
-        feats = preprocess_request(payload)
-        model = load_model(Settings())
-        preds = predict(model, feats)
+        preds = predict_payload(Settings(), payload)
         return jsonify({"predictions": preds}), 200
+    except Overloaded:
+        return _overloaded()
+    except SchemaError as e:
+        return _invalid_request(e)
     except Exception as e:
         logger.exception("Prediction failed")
         return jsonify({"error": str(e)}), 400
+
+
+@bp.post("/rank")
+def rank_route():
+    """Rank all coupon types for one context; ``?k=N`` keeps the best N."""
+    try:
+        payload = request.get_json(force=True, silent=False)
+        ranking = rank_payload(Settings(), payload, parse_top_k(request.args.get("k")))
+        return jsonify({"ranking": ranking}), 200
+    except SchemaError as e:
+        return _invalid_request(e)
+    except Exception as e:
+        logger.exception("Ranking failed")
+        return jsonify({"error": str(e)}), 400
+
+
+def _iter_ndjson_lines() -> Iterator[Any]:
+    """Parse the request body line by line; bad lines become per-row errors."""
+    for line in request.stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON line: {e}")
+
+
+@bp.post("/predict:batch")
+def predict_batch_route():
+    """Score a JSON array or an NDJSON stream of records.
+
+    Responds with NDJSON, one ``{"index", "prediction"|"error"}`` object per
+    input record, streamed as each chunk is scored.
+    """
+    settings = Settings()
+    try:
+        bundle = load_model(settings)
+        if request.mimetype in NDJSON_MIMETYPES:
+            records = _iter_ndjson_lines()
+        else:
+            records = request.get_json(force=True, silent=False)
+            if not isinstance(records, list):
+                raise ValueError("Request JSON must be an array of objects")
+    except Exception as e:
+        logger.exception("Batch prediction failed")
+        return jsonify({"error": str(e)}), 400
+
+    def generate() -> Iterator[str]:
+        for result in score_records(bundle, records, settings.BATCH_CHUNK_SIZE):
+            yield json.dumps(result) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
@@ -1,20 +1,98 @@
 from __future__ import annotations
 
-from flask import Flask
+import gc
+import time
 
+from flask import Flask, g, request
+
+from coupon_reco import metrics
 from coupon_reco.api.routes import bp
 from coupon_reco.config import Settings
+from coupon_reco.inference import predictor
+from coupon_reco.inference.batcher import get_batcher
+from coupon_reco.inference.reloader import ModelWatcher
+from coupon_reco.inference.warmup import WarmUp
 from coupon_reco.logging import configure_logging
 
 
-def create_app() -> Flask:
+def create_app(preload: bool | None = None) -> Flask:
+    """Build the Flask app.
+
+    With ``preload`` (default: Settings.PRELOAD_MODEL) the model is loaded and
+    warmed up in the background; /readyz stays not-ready until that is done.
+    """
     settings = Settings()
-    configure_logging(settings.LOG_LEVEL)
+    configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 
     app = Flask(__name__)
     app.register_blueprint(bp)
+
+    metrics.configure_metrics(settings.METRICS_ENABLED)
+    if settings.METRICS_ENABLED:
+        _instrument(app)
+
+    if settings.PRELOAD_MODEL if preload is None else preload:
+        warmup = WarmUp(settings)
+        app.extensions["warmup"] = warmup
+        warmup.start()
+
+    if settings.MODEL_RELOAD_INTERVAL_S > 0:
+        watcher = ModelWatcher(settings, settings.MODEL_RELOAD_INTERVAL_S)
+        app.extensions["model_watcher"] = watcher
+        watcher.start()
     return app
 
 
+def _instrument(app: Flask) -> None:
+    """Record request latency and body size for every routed request."""
+
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        # Streamed responses (/predict:batch) are timed up to the first byte.
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        if endpoint != "/metrics":
+            metrics.observe(
+                metrics.REQUEST_LATENCY, time.perf_counter() - g.request_start, endpoint, str(response.status_code)
+            )
+            if request.content_length:
+                metrics.observe(metrics.PAYLOAD_BYTES, request.content_length, endpoint)
+        return response
+
+
+def prepare_fork(app: Flask) -> None:
+    """Finish loading the model in the gunicorn master before workers fork.
+
+    Waits for warm-up (or loads the model if it is off) so every worker
+    inherits the loaded bundle, then moves all objects into the permanent GC
+    generation so collections in the workers do not write to, and so copy,
+    the pages they share with the master.
+    """
+    warmup = app.extensions.get("warmup")
+    if warmup is not None:
+        warmup.done.wait()
+    else:
+        predictor.load_model(Settings())
+    gc.freeze()
+
+
+def restart_after_fork(app: Flask) -> None:
+    """Recreate per-process state in a worker forked from a preloaded master.
+
+    Threads do not survive ``fork``, so the micro-batcher and model watcher
+    are rebuilt lazily or restarted here. GCS clients hold sockets that must
+    not be shared between processes, so each worker creates its own.
+    """
+    get_batcher.cache_clear()
+    predictor.reset_storage_clients()
+    watcher = app.extensions.get("model_watcher")
+    if watcher is not None:
+        app.extensions["model_watcher"] = watcher = ModelWatcher(watcher.settings, watcher.interval_s)
+        watcher.start()
+
+
 # Gunicorn entrypoint
 app = create_app()
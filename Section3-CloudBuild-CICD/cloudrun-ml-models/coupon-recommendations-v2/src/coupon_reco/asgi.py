@@ -0,0 +1,259 @@
+"""ASGI entry point (Starlette), an alternative to the Flask app under gunicorn.
+
+Run with ``uvicorn coupon_reco.asgi:app --port $PORT``. The event loop only
+parses requests and writes responses; preprocessing and ``model.predict`` run
+in a bounded thread pool (``ASGI_EXECUTOR_THREADS``). At most
+``ASGI_MAX_PENDING`` requests may wait for that pool, beyond which requests
+get a 503 instead of queueing without limit.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from coupon_reco import metrics
+from coupon_reco.api.routes import NDJSON_MIMETYPES
+from coupon_reco.config import Settings
+from coupon_reco.inference.arrow import ARROW_STREAM_MIMETYPE, COLUMNAR_MIMETYPES, score_columnar
+from coupon_reco.inference.batch import iter_chunks, score_chunk
+from coupon_reco.inference.batcher import Overloaded, get_batcher
+from coupon_reco.inference.cache import get_prediction_cache
+from coupon_reco.inference.predictor import load_model
+from coupon_reco.inference.reloader import ModelWatcher
+from coupon_reco.inference.schema import SchemaError
+from coupon_reco.inference.serving import parse_top_k, predict_payload, rank_payload
+from coupon_reco.inference.warmup import WarmUp
+from coupon_reco.logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+async def _run(request: Request, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run ``fn(*args)`` in the app's executor; ``Overloaded`` past ASGI_MAX_PENDING waiting requests."""
+    state = request.app.state
+    if state.pending >= state.max_pending:
+        raise Overloaded("Too many pending requests")
+    # Only the event loop thread touches the counter, so no lock is needed.
+    state.pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(state.executor, fn, *args)
+    finally:
+        state.pending -= 1
+
+
+def _overloaded() -> JSONResponse:
+    return JSONResponse({"error": "overloaded"}, status_code=503, headers={"Retry-After": "1"})
+
+
+def _invalid_request(e: SchemaError) -> JSONResponse:
+    logger.debug("Rejected request: %s", e)
+    return JSONResponse({"error": str(e), "fields": e.errors}, status_code=400)
+
+
+async def healthz(request: Request) -> Response:
+    return JSONResponse({"status": "ok"})
+
+
+async def readyz(request: Request) -> Response:
+    """Readiness: ensure model can be loaded (and warm-up, if enabled, has finished)."""
+    warmup = request.app.state.warmup
+    if warmup is not None and not warmup.done.is_set():
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    try:
+        await asyncio.get_running_loop().run_in_executor(request.app.state.executor, load_model, Settings())
+        return JSONResponse({"status": "ready"})
+    except Exception as e:
+        logger.exception("Readiness check failed")
+        return JSONResponse({"status": "not_ready", "error": str(e)}, status_code=500)
+
+
+async def statsz(request: Request) -> Response:
+    """In-process serving counters."""
+    settings = Settings()
+    stats: dict[str, Any] = {"executor": {"pending": request.app.state.pending}}
+    watcher = request.app.state.model_watcher
+    if watcher is not None:
+        bundle = load_model(settings)
+        stats["model"] = {"version": bundle.version, "generation": bundle.generation, **watcher.stats()}
+    if settings.BATCHING_ENABLED:
+        stats["batcher"] = get_batcher(settings).stats()
+    cache = get_prediction_cache(settings)
+    if cache is not None:
+        stats["cache"] = cache.stats()
+    return JSONResponse(stats)
+
+
+async def metrics_route(request: Request) -> Response:
+    """Prometheus scrape endpoint (404 when METRICS_ENABLED is off)."""
+    if not metrics.enabled():
+        return JSONResponse({"error": "metrics are disabled"}, status_code=404)
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+async def predict_route(request: Request) -> Response:
+    """Score one JSON request, or an Arrow stream / Parquet table of requests."""
+    try:
+        mimetype = request.headers.get("content-type", "").split(";")[0].strip()
+        if mimetype in COLUMNAR_MIMETYPES:
+            bundle = await _run(request, load_model, Settings())
+            body = await _run(request, score_columnar, bundle, await request.body(), mimetype)
+            return Response(body, media_type=ARROW_STREAM_MIMETYPE)
+        payload = json.loads(await request.body())
+        preds = await _run(request, predict_payload, Settings(), payload)
+        return JSONResponse({"predictions": preds})
+    except Overloaded:
+        return _overloaded()
+    except SchemaError as e:
+        return _invalid_request(e)
+    except Exception as e:
+        logger.exception("Prediction failed")
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+
+async def rank_route(request: Request) -> Response:
+    """Rank all coupon types for one context; ``?k=N`` keeps the best N."""
+    try:
+        payload = json.loads(await request.body())
+        k = parse_top_k(request.query_params.get("k"))
+        ranking = await _run(request, rank_payload, Settings(), payload, k)
+        return JSONResponse({"ranking": ranking})
+    except Overloaded:
+        return _overloaded()
+    except SchemaError as e:
+        return _invalid_request(e)
+    except Exception as e:
+        logger.exception("Ranking failed")
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+
+def _parse_batch(body: bytes, ndjson: bool) -> list[Any]:
+    if not ndjson:
+        records = json.loads(body)
+        if not isinstance(records, list):
+            raise ValueError("Request JSON must be an array of objects")
+        return records
+    records = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError as e:
+            records.append(ValueError(f"Invalid JSON line: {e}"))
+    return records
+
+
+async def predict_batch_route(request: Request) -> Response:
+    """Score a JSON array or an NDJSON body; same contract as the Flask route.
+
+    The body is read in full, then each ``BATCH_CHUNK_SIZE`` chunk is scored
+    in the executor and streamed back as NDJSON.
+    """
+    settings = Settings()
+    try:
+        bundle = await _run(request, load_model, settings)
+        mimetype = request.headers.get("content-type", "").split(";")[0].strip()
+        records = await _run(request, _parse_batch, await request.body(), mimetype in NDJSON_MIMETYPES)
+    except Overloaded:
+        return _overloaded()
+    except Exception as e:
+        logger.exception("Batch prediction failed")
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    async def generate() -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        offset = 0
+        for chunk in iter_chunks(records, settings.BATCH_CHUNK_SIZE):
+            # Already admitted, so later chunks wait for the pool instead of failing mid-stream.
+            results = await loop.run_in_executor(request.app.state.executor, score_chunk, bundle, chunk, offset)
+            yield "".join(json.dumps(result) + "\n" for result in results)
+            offset += len(chunk)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+ROUTES = [
+    Route("/healthz", healthz, methods=["GET"]),
+    Route("/readyz", readyz, methods=["GET"]),
+    Route("/statsz", statsz, methods=["GET"]),
+    Route("/metrics", metrics_route, methods=["GET"]),
+    Route("/predict", predict_route, methods=["POST"]),
+    Route("/predict:batch", predict_batch_route, methods=["POST"]),
+    Route("/rank", rank_route, methods=["POST"]),
+]
+_ROUTE_PATHS = {route.path for route in ROUTES}
+
+
+class _Instrument:
+    """ASGI middleware recording request latency and body size, like the Flask hooks."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        path = scope.get("path")
+        if scope["type"] != "http" or path == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = path if path in _ROUTE_PATHS else "unmatched"
+        start = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                # Streamed responses (/predict:batch) are timed up to the first byte.
+                metrics.observe(
+                    metrics.REQUEST_LATENCY, time.perf_counter() - start, endpoint, str(message["status"])
+                )
+            await send(message)
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and int(value):
+                metrics.observe(metrics.PAYLOAD_BYTES, int(value), endpoint)
+        await self.app(scope, receive, send_wrapper)
+
+
+def create_app(preload: bool | None = None) -> Starlette:
+    """Build the ASGI app; ``preload`` behaves as in ``coupon_reco.app.create_app``."""
+    settings = Settings()
+    configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+    metrics.configure_metrics(settings.METRICS_ENABLED)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        app.state.executor = ThreadPoolExecutor(settings.ASGI_EXECUTOR_THREADS, thread_name_prefix="asgi-predict")
+        app.state.pending = 0
+        app.state.max_pending = settings.ASGI_MAX_PENDING
+        app.state.warmup = app.state.model_watcher = None
+
+        if settings.PRELOAD_MODEL if preload is None else preload:
+            app.state.warmup = WarmUp(settings)
+            app.state.warmup.start()
+        if settings.MODEL_RELOAD_INTERVAL_S > 0:
+            app.state.model_watcher = ModelWatcher(settings, settings.MODEL_RELOAD_INTERVAL_S)
+            app.state.model_watcher.start()
+        try:
+            yield
+        finally:
+            if app.state.model_watcher is not None:
+                app.state.model_watcher.stop()
+            app.state.executor.shutdown(wait=False, cancel_futures=True)
+
+    app = Starlette(routes=ROUTES, lifespan=lifespan)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(_Instrument)
+    return app
+
+
+# Uvicorn entrypoint
+app = create_app()
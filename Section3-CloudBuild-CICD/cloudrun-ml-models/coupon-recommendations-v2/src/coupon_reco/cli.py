@@ -0,0 +1,188 @@
+"""Command line entry point: ``coupon-reco score INPUT OUTPUT``.
+
+Scores a CSV or Parquet file offline, chunk by chunk, with the same feature
+plan and model as the service, and appends each chunk's predictions to the
+output as soon as it is scored. At most ``2 * workers`` chunks are held in
+memory at once, whatever the size of the input.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.arrow import table_features
+from coupon_reco.inference.features import REQUEST_FIELDS
+from coupon_reco.inference.predictor import load_model, predict
+from coupon_reco.logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in PARQUET_SUFFIXES
+
+
+def _rechunk(batches: Iterable[pa.RecordBatch], size: int) -> Iterator[pa.Table]:
+    """Regroup record batches into tables of exactly ``size`` rows (the last may be short)."""
+    pending: list[pa.RecordBatch] = []
+    rows = 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        while rows >= size:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, size)
+            rest = table.slice(size)
+            pending, rows = rest.to_batches(), rest.num_rows
+    if rows:
+        yield pa.Table.from_batches(pending)
+
+
+def read_chunks(path: Path, columns: Sequence[str], chunk_size: int) -> Iterator[pa.Table]:
+    """Stream ``columns`` of a CSV or Parquet file as tables of ``chunk_size`` rows."""
+    if _is_parquet(path):
+        return _rechunk(pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=list(columns)), chunk_size)
+    # Read every field as text: type inference on the first block can be
+    # wrong for later ones, and the feature plan hashes/parses str values the
+    # same way as the JSON ints. Empty cells are missing, as in pandas.
+    reader = pacsv.open_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(columns),
+            column_types=dict.fromkeys(columns, pa.string()),
+            strings_can_be_null=True,
+        ),
+    )
+    return _rechunk(reader, chunk_size)
+
+
+class ChunkWriter:
+    """Append tables to a CSV or Parquet file (format from the suffix)."""
+
+    def __init__(self, path: Path, schema: pa.Schema) -> None:
+        if _is_parquet(path):
+            self._writer = pq.ParquetWriter(path, schema)
+        else:
+            self._writer = pacsv.CSVWriter(path, schema)
+
+    def write(self, table: pa.Table) -> None:
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def score_table(settings: Settings, table: pa.Table) -> list[int]:
+    """Predictions for every row of ``table``; runs in the pool workers."""
+    bundle = load_model(settings)
+    return predict(bundle, table_features(bundle.plan, table)) if table.num_rows else []
+
+
+class _InlineExecutor(Executor):
+    """Runs work in the calling process, for ``--workers 1``."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def score_file(
+    settings: Settings,
+    input_path: Path,
+    output_path: Path,
+    chunk_size: int,
+    workers: int,
+    keep: Sequence[str] = (),
+) -> int:
+    """Score ``input_path`` into ``output_path``; return the number of rows scored.
+
+    The output has a ``row`` column (0-based input row), the ``keep``
+    columns copied from the input, and ``prediction``, in input order.
+    """
+    columns = list(dict.fromkeys([*REQUEST_FIELDS, *keep]))
+    executor = ProcessPoolExecutor(workers) if workers > 1 else _InlineExecutor()
+    in_flight: deque[tuple[int, pa.Table, Future]] = deque()
+    writer: ChunkWriter | None = None
+    rows = 0
+
+    def drain(limit: int) -> None:
+        nonlocal writer
+        while len(in_flight) > limit:
+            offset, table, future = in_flight.popleft()
+            try:
+                preds = future.result()
+            except ValueError as e:
+                raise ValueError(f"rows {offset}-{offset + table.num_rows - 1}: {e}") from None
+            out = pa.table(
+                {
+                    "row": pa.array(range(offset, offset + table.num_rows), pa.int64()),
+                    **{name: table.column(name) for name in keep},
+                    "prediction": pa.array(preds),
+                }
+            )
+            if writer is None:
+                writer = ChunkWriter(output_path, out.schema)
+            writer.write(out)
+
+    try:
+        for table in read_chunks(input_path, columns, chunk_size):
+            in_flight.append((rows, table, executor.submit(score_table, settings, table.select(REQUEST_FIELDS))))
+            rows += table.num_rows
+            drain(2 * workers)
+        drain(0)
+    finally:
+        executor.shutdown(cancel_futures=True)
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="coupon-reco", description="Coupon recommendation tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    score = commands.add_parser("score", help="score a CSV or Parquet file offline")
+    score.add_argument("input", type=Path, help="CSV or Parquet (.parquet/.pq) file with the request fields")
+    score.add_argument("output", type=Path, help="CSV or Parquet file to write predictions to")
+    score.add_argument("--chunk-size", type=int, default=50_000, help="rows per model.predict call")
+    score.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes")
+    score.add_argument("--keep", action="append", default=[], help="input column to copy to the output")
+    score.add_argument("--model-uri", help="override MODEL_URI")
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    if args.model_uri:
+        settings = dataclasses.replace(settings, MODEL_URI=args.model_uri)
+    configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+    start = time.perf_counter()
+    try:
+        rows = score_file(settings, args.input, args.output, args.chunk_size, args.workers, args.keep)
+    except (OSError, ValueError, pa.ArrowException) as e:
+        logger.error("Scoring %s failed: %s", args.input, e)
+        return 1
+    elapsed = time.perf_counter() - start
+    logger.info("Scored %d rows in %.2fs (%.0f rows/s)", rows, elapsed, rows / elapsed if elapsed else 0.0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
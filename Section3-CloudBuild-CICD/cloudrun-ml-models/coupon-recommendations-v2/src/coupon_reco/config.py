@@ -2,6 +2,10 @@ import os
 from dataclasses import dataclass
 
 
+def _env_bool(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass(frozen=True)
 class Settings:
     """Runtime configuration loaded from environment variables."""
@@ -10,8 +14,52 @@ class Settings:
     # Supported:
     #   - local file path (default)
     #   - gs://bucket/path/to/model.pkl
+    # A .bst/.json/.ubj suffix loads a native XGBoost model instead of a pickle.
     MODEL_URI: str = os.getenv("MODEL_URI", "artifacts/xgboost_coupon_recommendation.pkl")
 
+    # Optional directory for GCS artifacts, keyed by object generation. A
+    # restart that finds the current generation there skips the download.
+    MODEL_CACHE_DIR: str = os.getenv("MODEL_CACHE_DIR", "")
+
+    # Fitted HashingEncoder saved by training/build_encoder.py.
+    # Empty means hashing_encoder.pkl next to MODEL_URI.
+    ENCODER_URI: str = os.getenv("ENCODER_URI", "")
+
+    # Value -> hash bucket table saved by training/build_encoder.py; values
+    # not in it are hashed. Empty means hash_buckets.json next to MODEL_URI.
+    HASH_BUCKETS_URI: str = os.getenv("HASH_BUCKETS_URI", "")
+
+    # Rows scored per model.predict call by /predict:batch.
+    BATCH_CHUNK_SIZE: int = int(os.getenv("BATCH_CHUNK_SIZE", "1000"))
+
+    # Opt-in micro-batching of concurrent /predict calls: wait up to
+    # BATCHING_MAX_WAIT_MS for up to BATCHING_MAX_ROWS rows per model call.
+    # Requests beyond BATCHING_MAX_QUEUE waiting ones get a 503 (0 = no limit).
+    BATCHING_ENABLED: bool = _env_bool("BATCHING_ENABLED")
+    BATCHING_MAX_ROWS: int = int(os.getenv("BATCHING_MAX_ROWS", "32"))
+    BATCHING_MAX_WAIT_MS: float = float(os.getenv("BATCHING_MAX_WAIT_MS", "2"))
+    BATCHING_MAX_QUEUE: int = int(os.getenv("BATCHING_MAX_QUEUE", "256"))
+
+    # Opt-in in-process LRU cache of /predict results keyed on the model
+    # version and payload. 0 (the default) disables it.
+    PREDICTION_CACHE_SIZE: int = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+    PREDICTION_CACHE_TTL_S: float = float(os.getenv("PREDICTION_CACHE_TTL_S", "300"))
+
+    # Poll MODEL_URI every N seconds and hot-swap a new artifact. 0 disables it.
+    MODEL_RELOAD_INTERVAL_S: float = float(os.getenv("MODEL_RELOAD_INTERVAL_S", "0"))
+
+    # ASGI mode (coupon_reco.asgi:app): threads running preprocessing and
+    # model.predict, and requests allowed to wait for one before 503.
+    ASGI_EXECUTOR_THREADS: int = int(os.getenv("ASGI_EXECUTOR_THREADS", "4"))
+    ASGI_MAX_PENDING: int = int(os.getenv("ASGI_MAX_PENDING", "64"))
+
+    # Gunicorn processes (0 = one per CPU) and threads per process; read by
+    # gunicorn.conf.py. With GUNICORN_PRELOAD the model is loaded once in the
+    # master and shared copy-on-write by the forked workers.
+    GUNICORN_WORKERS: int = int(os.getenv("GUNICORN_WORKERS", "1"))
+    GUNICORN_THREADS: int = int(os.getenv("GUNICORN_THREADS", "8"))
+    GUNICORN_PRELOAD: bool = _env_bool("GUNICORN_PRELOAD")
+
     # Flask/Gunicorn/Cloud Run listens on this port.
     PORT: int = int(os.getenv("PORT", "8080"))
 
@@ -20,3 +68,12 @@ class Settings:
 
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" or "json" (structured lines for Cloud Logging).
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+
+    # Prometheus histograms and the /metrics endpoint.
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", "true")
+
+    # Load the model and run a warm-up prediction when the app starts;
+    # /readyz reports not-ready until it finishes.
+    PRELOAD_MODEL: bool = _env_bool("PRELOAD_MODEL")
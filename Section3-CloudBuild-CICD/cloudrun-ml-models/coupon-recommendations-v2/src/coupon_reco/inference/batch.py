@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import logging
+import time
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from coupon_reco import metrics
+from coupon_reco.inference.predictor import ModelBundle, predict
+from coupon_reco.inference.schema import validate_request
+
+logger = logging.getLogger(__name__)
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Yield lists of up to ``size`` items."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def score_chunk(bundle: ModelBundle, records: list[Any], offset: int = 0) -> list[dict[str, Any]]:
+    """Score a chunk of raw records with a single ``model.predict`` call.
+
+    A record may be an exception (e.g. an unparsable NDJSON line); it and any
+    record that fails the request schema get an ``error`` entry, the rest a
+    ``prediction``. Results keep input order and carry their ``index``.
+    """
+    results: list[dict[str, Any]] = [{"index": offset + i} for i in range(len(records))]
+    features = np.zeros((len(records), len(bundle.plan.columns)), dtype=np.float32)
+    valid: list[int] = []
+
+    start = time.perf_counter()
+    for i, record in enumerate(records):
+        row = features[len(valid)]
+        try:
+            if isinstance(record, Exception):
+                raise record
+            validate_request(record)
+            bundle.plan.fill_row(record, row)
+        except Exception as e:
+            row[:] = 0
+            results[i]["error"] = str(e)
+        else:
+            valid.append(i)
+    metrics.observe(metrics.PREPROCESS_SECONDS, time.perf_counter() - start)
+
+    if valid:
+        try:
+            preds = predict(bundle, features[: len(valid)])
+        except Exception as e:
+            logger.exception("Batch prediction failed for rows %d-%d", offset, offset + len(records) - 1)
+            for i in valid:
+                results[i]["error"] = str(e)
+        else:
+            for i, pred in zip(valid, preds):
+                results[i]["prediction"] = pred
+
+    return results
+
+
+def score_records(bundle: ModelBundle, records: Iterable[Any], chunk_size: int) -> Iterator[dict[str, Any]]:
+    """Lazily score ``records`` chunk by chunk, yielding one result per record."""
+    offset = 0
+    for chunk in iter_chunks(records, chunk_size):
+        yield from score_chunk(bundle, chunk, offset)
+        offset += len(chunk)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.predictor import predict
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(RuntimeError):
+    """Raised when a request cannot be queued; the apps answer 503 "overloaded"."""
+
+
+class MicroBatcher:
+    """Coalesce concurrent prediction calls into one ``model.predict``.
+
+    Request threads ``submit`` feature rows with the model to score them and
+    block on the returned future. A single worker thread takes the first
+    waiting submission, keeps collecting until ``max_rows`` rows are queued
+    or ``max_wait_ms`` has passed, scores them together (one call per model,
+    so a hot reload never mixes bundles) and hands each caller its own slice.
+    At most ``max_queue`` submissions may wait (0 = no limit); beyond that
+    ``submit`` raises ``Overloaded``.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[Any, np.ndarray], list[Any]],
+        max_rows: int,
+        max_wait_ms: float,
+        max_queue: int = 0,
+    ) -> None:
+        self._predict_fn = predict_fn
+        self.max_rows = max_rows
+        self.max_wait_s = max_wait_ms / 1000
+        self._queue: queue.Queue[tuple[Any, np.ndarray, Future]] = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._rejected = 0
+        self._batches = 0
+        self._rows = 0
+        self._max_batch_size = 0
+        self._last_batch_size = 0
+        self._max_queue_depth = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, model: Any, features: np.ndarray) -> Future:
+        """Queue a ``(n, n_features)`` matrix; the future resolves to ``model``'s n predictions."""
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((model, features, future))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise Overloaded("Micro-batch queue is full") from None
+        with self._lock:
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return future
+
+    def predict(self, model: Any, features: np.ndarray) -> list[Any]:
+        """Submit and wait for the result."""
+        return self.submit(model, features).result()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "rejected": self._rejected,
+                "batches": self._batches,
+                "rows": self._rows,
+                "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+                "max_batch_size": self._max_batch_size,
+                "last_batch_size": self._last_batch_size,
+            }
+
+    def _collect(self) -> list[tuple[Any, np.ndarray, Future]]:
+        batch = [self._queue.get()]
+        rows = len(batch[0][1])
+        deadline = time.monotonic() + self.max_wait_s
+        while rows < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += len(item[1])
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            groups: dict[int, tuple[Any, list[tuple[np.ndarray, Future]]]] = {}
+            for model, features, future in self._collect():
+                groups.setdefault(id(model), (model, []))[1].append((features, future))
+            for model, items in groups.values():
+                self._score(model, items)
+
+    def _score(self, model: Any, items: list[tuple[np.ndarray, Future]]) -> None:
+        features = np.concatenate([f for f, _ in items]) if len(items) > 1 else items[0][0]
+        try:
+            preds = self._predict_fn(model, features)
+        except Exception as e:
+            logger.exception("Micro-batch of %d rows failed", len(features))
+            for _, future in items:
+                future.set_exception(e)
+        else:
+            start = 0
+            for f, future in items:
+                future.set_result(preds[start : start + len(f)])
+                start += len(f)
+        with self._lock:
+            self._batches += 1
+            self._rows += len(features)
+            self._last_batch_size = len(features)
+            self._max_batch_size = max(self._max_batch_size, len(features))
+
+
+@lru_cache(maxsize=1)
+def get_batcher(settings: Settings) -> MicroBatcher:
+    """Process-wide batcher; each submission carries the bundle that scores it."""
+    return MicroBatcher(
+        predict,
+        max_rows=settings.BATCHING_MAX_ROWS,
+        max_wait_ms=settings.BATCHING_MAX_WAIT_MS,
+        max_queue=settings.BATCHING_MAX_QUEUE,
+    )
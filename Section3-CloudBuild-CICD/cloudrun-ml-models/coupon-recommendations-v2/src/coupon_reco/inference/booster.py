@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import numpy as np
+import xgboost as xgb
+
+# Artifacts written by ``Booster.save_model`` / ``XGBClassifier.save_model``.
+NATIVE_MODEL_SUFFIXES = (".bst", ".json", ".ubj")
+
+
+class BoosterModel:
+    """A native XGBoost Booster behind the ``XGBClassifier`` predict API.
+
+    Native artifacts load without unpickling the sklearn wrapper and do not
+    depend on the xgboost version that wrote them. Predictions go through
+    ``inplace_predict``, which skips building a ``DMatrix``.
+    """
+
+    def __init__(self, booster: xgb.Booster, threshold: float = 0.5) -> None:
+        self.booster = booster
+        self.threshold = threshold
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "BoosterModel":
+        """Load a binary, JSON or UBJSON model from memory."""
+        booster = xgb.Booster()
+        booster.load_model(bytearray(raw))
+        return cls(booster)
+
+    @property
+    def feature_names_in_(self) -> np.ndarray | None:
+        names = self.booster.feature_names
+        return np.asarray(names) if names else None
+
+    def predict_proba(self, features) -> np.ndarray:
+        positive = self.booster.inplace_predict(features)
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, features) -> np.ndarray:
+        # Same rule as XGBClassifier.predict for binary:logistic.
+        return (self.booster.inplace_predict(features) > self.threshold).astype(np.int64)
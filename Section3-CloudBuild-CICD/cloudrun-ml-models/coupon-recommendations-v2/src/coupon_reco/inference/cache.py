@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable
+
+from coupon_reco.config import Settings
+
+
+class PredictionCache:
+    """Bounded LRU cache with a TTL for single-request predictions.
+
+    Keys are a SHA-256 of the payload serialized with sorted keys, so field
+    order and whitespace do not matter. Entries are stored under
+    ``(version, key)``: after a model reload the new version simply misses,
+    and the old version's entries age out through the LRU and TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(payload: Any) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, version: str) -> Any | None:
+        """Cached value for ``key`` under model ``version``, or None."""
+        with self._lock:
+            entry = self._entries.get((version, key))
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end((version, key))
+                    self.hits += 1
+                    return value
+                del self._entries[(version, key)]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, version: str, value: Any) -> None:
+        with self._lock:
+            self._entries[(version, key)] = (self._clock() + self.ttl_s, value)
+            self._entries.move_to_end((version, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_prediction_cache(settings: Settings) -> PredictionCache | None:
+    """Process-wide cache, or None when PREDICTION_CACHE_SIZE is 0."""
+    if settings.PREDICTION_CACHE_SIZE <= 0:
+        return None
+    return PredictionCache(settings.PREDICTION_CACHE_SIZE, settings.PREDICTION_CACHE_TTL_S)
@@ -3,6 +3,79 @@ from __future__ import annotations
 import pandas as pd
 from category_encoders import HashingEncoder
 
+# Raw fields accepted by /predict, in training CSV column order.
+REQUEST_FIELDS = [
+    "destination",
+    "passanger",
+    "weather",
+    "temperature",
+    "time",
+    "coupon",
+    "expiration",
+    "gender",
+    "age",
+    "maritalStatus",
+    "has_children",
+    "education",
+    "occupation",
+    "income",
+    "Bar",
+    "CoffeeHouse",
+    "CarryAway",
+    "RestaurantLessThan20",
+    "Restaurant20To50",
+    "toCoupon_GEQ15min",
+    "toCoupon_GEQ25min",
+    "direction_same",
+]
+
+HASHED_COLUMNS = ["passanger_destination", "marital_hasChildren", "occupation", "coupon", "temperature_weather"]
+N_COMPONENTS = 27
+
+# Coupon types seen in training; /rank scores one context against each.
+COUPON_VALUES = ["Restaurant(<20)", "Coffee House", "Carry out & Take away", "Bar", "Restaurant(20-50)"]
+
+AGE_MAPPING = {
+    "below21": "<21",
+    "21": "21-30",
+    "26": "21-30",
+    "31": "31-40",
+    "36": "31-40",
+    "41": "41-50",
+    "46": "41-50",
+}
+
+_FREQUENCY = {"never": 0, "less1": 1, "1~3": 2, "4~8": 3, "gt8": 4}
+
+ORDINAL_MAPPINGS = {
+    "expiration": {"2h": 0, "1d": 1},
+    "age": {"<21": 0, "21-30": 1, "31-40": 2, "41-50": 3, ">50": 4},
+    "education": {
+        "Some High School": 0,
+        "High School Graduate": 1,
+        "Some college - no degree": 2,
+        "Associates degree": 3,
+        "Bachelors degree": 4,
+        "Graduate degree (Masters or Doctorate)": 5,
+    },
+    "Bar": _FREQUENCY,
+    "CoffeeHouse": _FREQUENCY,
+    "CarryAway": _FREQUENCY,
+    "Restaurant20To50": _FREQUENCY,
+    "income": {
+        "Less than $12500": 0,
+        "$12500 - $24999": 1,
+        "$25000 - $37499": 2,
+        "$37500 - $49999": 3,
+        "$50000 - $62499": 4,
+        "$62500 - $74999": 5,
+        "$75000 - $87499": 6,
+        "$87500 - $99999": 7,
+        "$100000 or More": 8,
+    },
+    "time": {"7AM": 0, "10AM": 1, "2PM": 2, "6PM": 3, "10PM": 4},
+}
+
 
 def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
     """Clean and feature-engineer raw request data.
@@ -14,16 +87,7 @@ def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
 
     df_fe = df.copy()
 
-    age_mapping = {
-        "below21": "<21",
-        "21": "21-30",
-        "26": "21-30",
-        "31": "31-40",
-        "36": "31-40",
-        "41": "41-50",
-        "46": "41-50",
-    }
-    df_fe["age"] = [age_mapping.get(str(v), ">50") for v in df_fe["age"]]
+    df_fe["age"] = [AGE_MAPPING.get(str(v), ">50") for v in df_fe["age"]]
 
     df_fe["passanger_destination"] = df_fe["passanger"].astype(str) + "-" + df_fe["destination"].astype(str)
     df_fe["marital_hasChildren"] = df_fe["maritalStatus"].astype(str) + "-" + df_fe["has_children"].astype(str)
@@ -35,55 +99,51 @@ def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
     )
     df_fe = df_fe.drop(columns=["gender", "RestaurantLessThan20"], errors="ignore")
 
-    df_le = df_fe.replace(
-        {
-            "expiration": {"2h": 0, "1d": 1},
-            "age": {"<21": 0, "21-30": 1, "31-40": 2, "41-50": 3, ">50": 4},
-            "education": {
-                "Some High School": 0,
-                "High School Graduate": 1,
-                "Some college - no degree": 2,
-                "Associates degree": 3,
-                "Bachelors degree": 4,
-                "Graduate degree (Masters or Doctorate)": 5,
-            },
-            "Bar": {"never": 0, "less1": 1, "1~3": 2, "4~8": 3, "gt8": 4},
-            "CoffeeHouse": {"never": 0, "less1": 1, "1~3": 2, "4~8": 3, "gt8": 4},
-            "CarryAway": {"never": 0, "less1": 1, "1~3": 2, "4~8": 3, "gt8": 4},
-            "Restaurant20To50": {"never": 0, "less1": 1, "1~3": 2, "4~8": 3, "gt8": 4},
-            "income": {
-                "Less than $12500": 0,
-                "$12500 - $24999": 1,
-                "$25000 - $37499": 2,
-                "$37500 - $49999": 3,
-                "$50000 - $62499": 4,
-                "$62500 - $74999": 5,
-                "$75000 - $87499": 6,
-                "$87500 - $99999": 7,
-                "$100000 or More": 8,
-            },
-            "time": {"7AM": 0, "10AM": 1, "2PM": 2, "6PM": 3, "10PM": 4},
-        }
-    )
+    df_le = df_fe.replace(ORDINAL_MAPPINGS)
 
     return df_le
 
 
-def encode_features(x: pd.DataFrame, n_components: int = 27) -> pd.DataFrame:
-    """Hash-encode a subset of categorical features."""
-    cols = ["passanger_destination", "marital_hasChildren", "occupation", "coupon", "temperature_weather"]
-    enc = HashingEncoder(cols=cols, n_components=n_components).fit(x)
-    x_encoded = enc.transform(x.reset_index(drop=True))
+def fit_encoder(x: pd.DataFrame, n_components: int = N_COMPONENTS) -> HashingEncoder:
+    """Fit the hashing encoder on preprocessed training data.
+
+    ``max_process=1`` keeps hashing in-process; the category_encoders default
+    starts a process pool on every ``transform`` call.
+    """
+    return HashingEncoder(cols=HASHED_COLUMNS, n_components=n_components, max_process=1).fit(x)
+
+
+def fit_template_encoder(n_components: int = N_COMPONENTS) -> HashingEncoder:
+    """Fit an encoder on a blank request.
+
+    Hashing does not depend on the fitted data, only on the input columns, so
+    this is equivalent to the training-time encoder when no artifact exists.
+    """
+    template = pd.DataFrame([dict.fromkeys(REQUEST_FIELDS, "")])
+    return fit_encoder(preprocess_data(template), n_components)
+
+
+def encode_features(
+    x: pd.DataFrame, n_components: int = N_COMPONENTS, encoder: HashingEncoder | None = None
+) -> pd.DataFrame:
+    """Hash-encode a subset of categorical features.
+
+    With a fitted ``encoder`` only ``transform`` runs; otherwise a new encoder
+    is fitted on ``x`` first (the original training-time behaviour).
+    """
+    if encoder is None:
+        encoder = fit_encoder(x, n_components)
+    x_encoded = encoder.transform(x.reset_index(drop=True))
     return x_encoded
 
 
-def preprocess_request(payload: dict) -> pd.DataFrame:
+def preprocess_request(payload: dict, encoder: HashingEncoder | None = None) -> pd.DataFrame:
     """Convert JSON payload to model-ready features."""
     if not isinstance(payload, dict):
         raise ValueError("Request JSON must be an object/dictionary")
 
     df = pd.DataFrame(payload, index=[0])
     x = preprocess_data(df)
-    x_encoded = encode_features(x)
+    x_encoded = encode_features(x, encoder=encoder)
     x_encoded = x_encoded.fillna(0)
     return x_encoded
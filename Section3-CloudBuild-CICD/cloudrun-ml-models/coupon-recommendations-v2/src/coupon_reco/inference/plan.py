@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from functools import partial
+from typing import Any, Callable, Iterable, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from coupon_reco.inference.features import AGE_MAPPING, HASHED_COLUMNS, N_COMPONENTS, ORDINAL_MAPPINGS
+
+# Non-hashed model inputs in the order preprocess_data leaves them for a
+# payload in REQUEST_FIELDS order, which is the order the model was trained on.
+NUMERIC_COLUMNS = [
+    "time",
+    "expiration",
+    "age",
+    "education",
+    "income",
+    "Bar",
+    "CoffeeHouse",
+    "CarryAway",
+    "Restaurant20To50",
+    "toCoupon_GEQ15min",
+    "toCoupon_GEQ25min",
+    "direction_same",
+]
+
+# Hashed features built by joining two raw fields with "-".
+CONCATENATED_COLUMNS = {
+    "passanger_destination": ("passanger", "destination"),
+    "marital_hasChildren": ("maritalStatus", "has_children"),
+    "temperature_weather": ("temperature", "weather"),
+}
+
+# Raw age value -> ordinal code; anything else is the ">50" bucket.
+AGE_CODES = {raw: ORDINAL_MAPPINGS["age"][group] for raw, group in AGE_MAPPING.items()}
+AGE_DEFAULT = ORDINAL_MAPPINGS["age"][">50"]
+
+# A column as (distinct values, per-row index into them).
+Factorized = Tuple[Sequence[Any], np.ndarray]
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _text(value: Any) -> str:
+    # pandas turns a missing value into NaN before hashing, so it hashes as "nan".
+    return "nan" if _is_missing(value) else str(value)
+
+
+def _ordinal(name: str, table: Mapping[Any, int], value: Any) -> float:
+    if _is_missing(value):
+        return 0
+    try:
+        return table[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unsupported value for {name!r}: {value!r}") from None
+
+
+def _numeric(name: str, value: Any) -> float:
+    if _is_missing(value):
+        return 0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Field {name!r} must be numeric, got {value!r}") from None
+
+
+def _field(payload: Mapping[str, Any], name: str) -> Any:
+    try:
+        value = payload[name]
+    except KeyError:
+        raise ValueError(f"Missing field: {name!r}") from None
+    if isinstance(value, (list, dict)):
+        raise ValueError(f"Field {name!r} must be a scalar, got {type(value).__name__}")
+    return value
+
+
+class FeaturePlan:
+    """Single-row equivalent of ``preprocess_data`` + ``encode_features``.
+
+    All lookup tables are built up front, so turning a request into a model
+    row is a handful of dict lookups and MD5 digests written into a float32
+    array, with no DataFrame in between. Output columns and values match the
+    pandas path for payloads sent in training field order.
+
+    Missing values (``None``/NaN) follow the single-row pandas behaviour:
+    ordinal and numeric fields become 0 and hashed fields hash ``"nan"``.
+    """
+
+    def __init__(
+        self, n_components: int = N_COMPONENTS, hash_method: str = "md5", buckets: Mapping[str, int] | None = None
+    ) -> None:
+        self.n_components = n_components
+        self.hash_method = hash_method
+        # Precomputed text -> bucket table (see build_bucket_table); values
+        # missing from it are hashed.
+        self._buckets = dict(buckets or {})
+        self.columns = [f"col_{i}" for i in range(n_components)] + NUMERIC_COLUMNS
+        self._hasher = getattr(hashlib, hash_method)
+
+        index = {name: n_components + i for i, name in enumerate(NUMERIC_COLUMNS)}
+        self._age_index = index["age"]
+        self._ordinals = [
+            (index[name], name, table) for name, table in ORDINAL_MAPPINGS.items() if name != "age"
+        ]
+        self._numerics = [(index[name], name) for name in NUMERIC_COLUMNS if name not in ORDINAL_MAPPINGS]
+        self._raw_hashed = [name for name in HASHED_COLUMNS if name not in CONCATENATED_COLUMNS]
+        self._pairs = list(CONCATENATED_COLUMNS.values())
+
+    @classmethod
+    def from_encoder(cls, encoder: Any, buckets: Mapping[str, int] | None = None) -> "FeaturePlan":
+        """Build a plan that reproduces a fitted ``HashingEncoder``."""
+        if list(encoder.cols) != HASHED_COLUMNS:
+            raise ValueError(f"Encoder hashes {list(encoder.cols)}, expected {HASHED_COLUMNS}")
+        return cls(n_components=encoder.n_components, hash_method=encoder.hash_method, buckets=buckets)
+
+    def bucket(self, value: str) -> int:
+        """Hash bucket of a string, identical to category_encoders' hashing trick."""
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            bucket = self.hash_bucket(value)
+        return bucket
+
+    def hash_bucket(self, value: str) -> int:
+        """``bucket`` computed from the digest, ignoring the precomputed table."""
+        digest = self._hasher(value.encode("utf-8")).digest()
+        return int.from_bytes(digest, "big") % self.n_components
+
+    def hashed_texts(self, payload: Mapping[str, Any]) -> list[str]:
+        """The strings hashed into ``col_*`` for one raw request, one per hashed feature."""
+        texts = [f"{_text(_field(payload, left))}-{_text(_field(payload, right))}" for left, right in self._pairs]
+        texts += [_text(_field(payload, name)) for name in self._raw_hashed]
+        return texts
+
+    def build_bucket_table(self, payloads: Iterable[Mapping[str, Any]]) -> dict[str, int]:
+        """Bucket of every hashed string in ``payloads``, e.g. the training data."""
+        return {text: self.hash_bucket(text) for payload in payloads for text in self.hashed_texts(payload)}
+
+    def fill_row(self, payload: Mapping[str, Any], row: np.ndarray) -> None:
+        """Write the features for one raw request into a zeroed ``row``."""
+        if not isinstance(payload, Mapping):
+            raise ValueError("Request JSON must be an object/dictionary")
+
+        bucket = self.bucket
+        for left, right in self._pairs:
+            row[bucket(f"{_text(_field(payload, left))}-{_text(_field(payload, right))}")] += 1
+        for name in self._raw_hashed:
+            row[bucket(_text(_field(payload, name)))] += 1
+
+        row[self._age_index] = AGE_CODES.get(str(_field(payload, "age")), AGE_DEFAULT)
+
+        for i, name, table in self._ordinals:
+            row[i] = _ordinal(name, table, _field(payload, name))
+        for i, name in self._numerics:
+            row[i] = _numeric(name, _field(payload, name))
+
+    def transform(self, payloads: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Build the ``(len(payloads), len(columns))`` feature matrix."""
+        out = np.zeros((len(payloads), len(self.columns)), dtype=np.float32)
+        for payload, row in zip(payloads, out):
+            self.fill_row(payload, row)
+        return out
+
+    def transform_one(self, payload: Mapping[str, Any]) -> np.ndarray:
+        """Build the feature matrix for a single request."""
+        return self.transform([payload])
+
+    def transform_variants(self, payload: Mapping[str, Any], field: str, values: Sequence[Any]) -> np.ndarray:
+        """Feature rows for ``payload`` with ``field`` set to each of ``values``.
+
+        For a directly hashed field (e.g. ``coupon``) only its bucket differs
+        between the rows, so the rest of the row is built once and copied.
+        """
+        if field not in self._raw_hashed or not values:
+            return self.transform([{**payload, field: value} for value in values])
+        out = np.repeat(self.transform_one({**payload, field: values[0]}), len(values), axis=0)
+        out[:, self.bucket(_text(values[0]))] -= 1
+        out[np.arange(len(values)), [self.bucket(_text(value)) for value in values]] += 1
+        return out
+
+    def transform_factorized(self, columns: Mapping[str, Factorized], n_rows: int) -> np.ndarray:
+        """Build the feature matrix from factorized columns.
+
+        Each column is ``(uniques, codes)`` where row ``i`` holds
+        ``uniques[codes[i]]`` (e.g. Arrow dictionary encoding), so hashing,
+        lookups and parsing run once per distinct value rather than per row.
+        Gives the same matrix as ``transform`` on the equivalent payloads.
+        """
+        out = np.zeros((n_rows, len(self.columns)), dtype=np.float32)
+        rows = np.arange(n_rows)
+
+        def column(name: str) -> Factorized:
+            try:
+                return columns[name]
+            except KeyError:
+                raise ValueError(f"Missing field: {name!r}") from None
+
+        def mapped(name: str, fn: Callable[[Any], float]) -> np.ndarray:
+            uniques, codes = column(name)
+            return np.array([fn(value) for value in uniques], dtype=np.float32)[codes]
+
+        for left, right in CONCATENATED_COLUMNS.values():
+            (lu, lc), (ru, rc) = column(left), column(right)
+            pairs, inverse = np.unique(lc.astype(np.int64) * len(ru) + rc, return_inverse=True)
+            buckets = np.array(
+                [self.bucket(f"{_text(lu[p // len(ru)])}-{_text(ru[p % len(ru)])}") for p in pairs], dtype=np.intp
+            )
+            out[rows, buckets[inverse]] += 1
+        for name in self._raw_hashed:
+            uniques, codes = column(name)
+            buckets = np.array([self.bucket(_text(value)) for value in uniques], dtype=np.intp)
+            out[rows, buckets[codes]] += 1
+
+        out[:, self._age_index] = mapped("age", lambda value: AGE_CODES.get(str(value), AGE_DEFAULT))
+
+        for i, name, table in self._ordinals:
+            out[:, i] = mapped(name, partial(_ordinal, name, table))
+        for i, name in self._numerics:
+            out[:, i] = mapped(name, partial(_numeric, name))
+        return out
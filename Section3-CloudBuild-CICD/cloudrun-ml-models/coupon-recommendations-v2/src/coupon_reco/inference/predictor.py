@@ -1,65 +1,275 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 import pickle
+import posixpath
 import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
 from functools import lru_cache
 from typing import Any
 
+import numpy as np
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 
+from coupon_reco import metrics
 from coupon_reco.config import Settings
+from coupon_reco.inference.booster import NATIVE_MODEL_SUFFIXES, BoosterModel
+from coupon_reco.inference.features import fit_template_encoder
+from coupon_reco.inference.plan import FeaturePlan
 
 logger = logging.getLogger(__name__)
 
+ENCODER_FILENAME = "hashing_encoder.pkl"
+HASH_BUCKETS_FILENAME = "hash_buckets.json"
 
-def _download_gcs_blob(gs_uri: str, dst_path: str, project: str | None = None) -> None:
-    """Download a GCS object to local file.
 
-    gs_uri: gs://bucket/path
-    """
+@dataclass(frozen=True)
+class ModelBundle:
+    """A trained model plus the fitted encoder it expects its features from."""
+
+    model: Any
+    encoder: Any
+    plan: FeaturePlan
+    # Content digest of the model artifact; changes whenever the model does.
+    version: str = ""
+    # Source generation (GCS object generation or local mtime) it was loaded from.
+    generation: str | None = None
+    # Seconds spent in each loading step, for startup logging.
+    load_timings: dict[str, float] = field(default_factory=dict, compare=False)
+
+
+_bundles: dict[Settings, ModelBundle] = {}
+_load_lock = threading.Lock()
+
+
+def _split_gcs_uri(gs_uri: str) -> tuple[str, str]:
+    """gs://bucket/path -> (bucket, path)."""
     assert gs_uri.startswith("gs://")
     without_scheme = gs_uri[len("gs://") :]
     bucket_name, _, blob_name = without_scheme.partition("/")
     if not bucket_name or not blob_name:
         raise ValueError(f"Invalid GCS URI: {gs_uri}")
+    return bucket_name, blob_name
+
+
+@lru_cache(maxsize=None)
+def _storage_client(project: str | None = None) -> storage.Client:
+    """One GCS client per project, shared by loads and the reload watcher."""
+    return storage.Client(project=project) if project else storage.Client()
+
+
+def reset_storage_clients() -> None:
+    """Drop the shared GCS clients, e.g. in a worker forked from a process that used them."""
+    _storage_client.cache_clear()
+
+
+def artifact_generation(uri: str, project: str | None = None) -> str:
+    """Cheap change marker for an artifact: GCS object generation or local mtime."""
+    if uri.startswith("gs://"):
+        bucket_name, blob_name = _split_gcs_uri(uri)
+        blob = _storage_client(project).bucket(bucket_name).get_blob(blob_name)
+        if blob is None:
+            raise FileNotFoundError(uri)
+        return str(blob.generation)
+    return str(os.stat(uri).st_mtime_ns)
+
+
+def _cache_prefix(uri: str) -> str:
+    return hashlib.sha256(uri.encode("utf-8")).hexdigest()[:16] + "-"
+
+
+def _cache_path(cache_dir: str, uri: str, generation: str) -> str:
+    return os.path.join(cache_dir, f"{_cache_prefix(uri)}{generation}{posixpath.splitext(uri)[1]}")
+
+
+def _write_cache(cache_dir: str, uri: str, generation: str, data: bytes) -> None:
+    """Atomically store ``data`` and drop cached copies of older generations."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, uri, generation)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    prefix = _cache_prefix(uri)
+    for name in os.listdir(cache_dir):
+        if name.startswith(prefix) and os.path.join(cache_dir, name) != path:
+            os.remove(os.path.join(cache_dir, name))
+
+
+def _read_gcs_artifact(
+    uri: str, project: str | None = None, generation: str | None = None, cache_dir: str = ""
+) -> bytes:
+    """Download a GCS object straight into memory.
+
+    With ``cache_dir`` the bytes are also kept on disk under the object
+    generation, and a later load of the same generation (e.g. a restarted
+    worker) reads that copy instead of downloading again.
+    """
+    if generation is None:
+        generation = artifact_generation(uri, project=project)
+    if cache_dir:
+        path = _cache_path(cache_dir, uri, generation)
+        if os.path.exists(path):
+            logger.info("Loading artifact %s generation %s from cache: %s", uri, generation, path)
+            with open(path, "rb") as f:
+                return f.read()
+
+    logger.info("Loading artifact from GCS: %s (generation %s)", uri, generation)
+    bucket_name, blob_name = _split_gcs_uri(uri)
+    blob = _storage_client(project).bucket(bucket_name).blob(blob_name, generation=int(generation))
+    data = blob.download_as_bytes()
+    if cache_dir:
+        _write_cache(cache_dir, uri, generation, data)
+    return data
+
+
+def _read_artifact(
+    uri: str, project: str | None = None, generation: str | None = None, cache_dir: str = ""
+) -> bytes:
+    """Read an artifact's bytes from a local path or gs:// URI."""
+    if uri.startswith("gs://"):
+        return _read_gcs_artifact(uri, project=project, generation=generation, cache_dir=cache_dir)
+
+    logger.info("Loading artifact from local path: %s", uri)
+    with open(uri, "rb") as f:
+        return f.read()
 
-    client = storage.Client(project=project) if project else storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(blob_name)
-    blob.download_to_filename(dst_path)
 
+def _load_pickle(uri: str, project: str | None = None, cache_dir: str = "") -> Any:
+    """Unpickle an artifact from a local path or gs:// URI."""
+    return pickle.loads(_read_artifact(uri, project=project, cache_dir=cache_dir))
 
-@lru_cache(maxsize=1)
-def load_model(settings: Settings | None = None) -> Any:
-    """Load the trained model once per container.
+
+def _deserialize_model(raw: bytes, uri: str) -> Any:
+    """Native XGBoost formats (.bst/.json/.ubj) load into a Booster; anything else is a pickle."""
+    if uri.lower().endswith(NATIVE_MODEL_SUFFIXES):
+        return BoosterModel.from_bytes(raw)
+    return pickle.loads(raw)
+
+
+def encoder_uri(settings: Settings) -> str:
+    """ENCODER_URI, or the encoder artifact next to MODEL_URI."""
+    return settings.ENCODER_URI or posixpath.join(posixpath.dirname(settings.MODEL_URI), ENCODER_FILENAME)
+
+
+def _load_encoder(settings: Settings) -> Any:
+    uri = encoder_uri(settings)
+    try:
+        return _load_pickle(uri, project=settings.GCP_PROJECT, cache_dir=settings.MODEL_CACHE_DIR)
+    except (FileNotFoundError, NotFound):
+        logger.warning("Encoder artifact not found at %s; fitting one from the request schema", uri)
+        return fit_template_encoder()
+
+
+def hash_buckets_uri(settings: Settings) -> str:
+    """HASH_BUCKETS_URI, or the bucket table next to MODEL_URI."""
+    return settings.HASH_BUCKETS_URI or posixpath.join(posixpath.dirname(settings.MODEL_URI), HASH_BUCKETS_FILENAME)
+
+
+def _load_hash_buckets(settings: Settings, encoder: Any) -> dict[str, int] | None:
+    """Precomputed hash buckets written by training/build_encoder.py, if present and matching ``encoder``."""
+    uri = hash_buckets_uri(settings)
+    try:
+        table = json.loads(_read_artifact(uri, project=settings.GCP_PROJECT, cache_dir=settings.MODEL_CACHE_DIR))
+    except (FileNotFoundError, NotFound):
+        logger.info("No hash bucket table at %s; hashing every value", uri)
+        return None
+    if (table.get("hash_method"), table.get("n_components")) != (encoder.hash_method, encoder.n_components):
+        logger.warning("Ignoring hash bucket table %s: built for a different encoder", uri)
+        return None
+    return table["buckets"]
+
+
+def _check_feature_order(model: Any, columns: list[str]) -> None:
+    """Fail fast if the model was trained on a different column order than the plan builds."""
+    trained = getattr(model, "feature_names_in_", None)
+    if trained is not None and list(trained) != columns:
+        raise ValueError(f"Model expects features {list(trained)}, feature plan builds {columns}")
+
+
+def _load_bundle(settings: Settings) -> ModelBundle:
+    timings = {}
+    generation = artifact_generation(settings.MODEL_URI, project=settings.GCP_PROJECT)
+
+    start = time.perf_counter()
+    raw = _read_artifact(
+        settings.MODEL_URI, project=settings.GCP_PROJECT, generation=generation, cache_dir=settings.MODEL_CACHE_DIR
+    )
+    timings["model_download_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = _deserialize_model(raw, settings.MODEL_URI)
+    timings["model_deserialize_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoder = _load_encoder(settings)
+    plan = FeaturePlan.from_encoder(encoder, buckets=_load_hash_buckets(settings, encoder))
+    timings["encoder_load_s"] = time.perf_counter() - start
+
+    _check_feature_order(model, plan.columns)
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    return ModelBundle(
+        model=model, encoder=encoder, plan=plan, version=version, generation=generation, load_timings=timings
+    )
+
+
+def load_model(settings: Settings | None = None) -> ModelBundle:
+    """Return the current model bundle, loading it once per container.
 
     The default uses a local artifact path. To load from GCS, set MODEL_URI=gs://...
+    Callers should hold on to the returned bundle for the whole request so a
+    concurrent ``reload_model`` cannot change the model halfway through.
 
     NOTE: Cloud Run service account must have GCS read permissions if using GCS.
     """
     settings = settings or Settings()
-    uri = settings.MODEL_URI
+    bundle = _bundles.get(settings)
+    if bundle is None:
+        with _load_lock:
+            bundle = _bundles.get(settings)
+            if bundle is None:
+                bundle = _bundles[settings] = _load_bundle(settings)
+    return bundle
 
-    if uri.startswith("gs://"):
-        logger.info("Loading model from GCS: %s", uri)
-        with tempfile.TemporaryDirectory() as td:
-            local_path = os.path.join(td, os.path.basename(uri))
-            _download_gcs_blob(uri, local_path, project=settings.GCP_PROJECT)
-            with open(local_path, "rb") as f:
-                return pickle.load(f)
-
-    logger.info("Loading model from local path: %s", uri)
-    with open(uri, "rb") as f:
-        return pickle.load(f)
 
+def reload_model(settings: Settings | None = None) -> ModelBundle:
+    """Load the artifacts again and swap the new bundle in.
+
+    Loading happens before the swap, so requests keep using the previous
+    bundle until the new one is ready; requests already running finish on it.
+    """
+    settings = settings or Settings()
+    bundle = _load_bundle(settings)
+    with _load_lock:
+        _bundles[settings] = bundle
+    logger.info("Swapped in model version %s (generation %s)", bundle.version, bundle.generation)
+    return bundle
 
-def predict(model: Any, features) -> list[int]:
+
+def predict(bundle: ModelBundle, features) -> list[int]:
     """Run model prediction and normalize output to a Python list."""
-    y = model.predict(features)
+    start = time.perf_counter()
+    y = bundle.model.predict(features)
+    metrics.observe(metrics.INFERENCE_SECONDS, time.perf_counter() - start)
+    metrics.observe(metrics.BATCH_SIZE, len(features))
     # xgboost/sklearn may return numpy array
     try:
         return y.tolist()  # type: ignore[attr-defined]
     except Exception:
         return [int(v) for v in y]
+
+
+def predict_proba(bundle: ModelBundle, features) -> np.ndarray:
+    """Probability of the positive class (coupon accepted) for each row."""
+    start = time.perf_counter()
+    proba = bundle.model.predict_proba(features)[:, 1]
+    metrics.observe(metrics.INFERENCE_SECONDS, time.perf_counter() - start)
+    metrics.observe(metrics.BATCH_SIZE, len(features))
+    return proba
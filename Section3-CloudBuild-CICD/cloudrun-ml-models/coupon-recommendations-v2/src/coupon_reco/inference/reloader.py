@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.predictor import artifact_generation, load_model, reload_model
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWatcher:
+    """Poll MODEL_URI and hot-swap the model when a new artifact appears.
+
+    A change is detected from the GCS object generation, or the file mtime
+    for local paths. The new artifact is loaded on this background thread and
+    swapped in with ``reload_model``, so requests never wait on a reload.
+    """
+
+    def __init__(self, settings: Settings, interval_s: float) -> None:
+        self.settings = settings
+        self.interval_s = interval_s
+        self.checks = 0
+        self.reloads = 0
+        self.last_error: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> bool:
+        """Reload if the artifact generation changed; return whether it did."""
+        self.checks += 1
+        current = load_model(self.settings)
+        generation = artifact_generation(self.settings.MODEL_URI, project=self.settings.GCP_PROJECT)
+        if generation == current.generation:
+            return False
+        logger.info("Model artifact changed (generation %s -> %s); reloading", current.generation, generation)
+        reload_model(self.settings)
+        self.reloads += 1
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.check()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the current model; try again on the next tick.
+                self.last_error = str(e)
+                logger.exception("Model reload check failed")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval_s": self.interval_s,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+from coupon_reco.inference.features import AGE_MAPPING, ORDINAL_MAPPINGS
+
+FREQUENCIES = tuple(ORDINAL_MAPPINGS["Bar"])
+AGE_VALUES = (*AGE_MAPPING, "50plus")
+
+
+@dataclass(frozen=True)
+class Field:
+    """One request field.
+
+    ``kind`` is ``"text"`` (any string), ``"integer"`` (an int, or a string
+    of digits) or ``"choice"`` (one of ``choices``). ``None`` is always
+    accepted and treated as a missing value, as in the training data.
+    """
+
+    kind: str
+    choices: tuple[str, ...] = ()
+    required: bool = True
+
+
+# The 22 raw fields of a /predict request, in training order. gender and
+# RestaurantLessThan20 are not model inputs, so they may be left out.
+REQUEST_SCHEMA: dict[str, Field] = {
+    "destination": Field("text"),
+    "passanger": Field("text"),
+    "weather": Field("text"),
+    "temperature": Field("integer"),
+    "time": Field("choice", tuple(ORDINAL_MAPPINGS["time"])),
+    "coupon": Field("text"),
+    "expiration": Field("choice", tuple(ORDINAL_MAPPINGS["expiration"])),
+    "gender": Field("text", required=False),
+    "age": Field("choice", AGE_VALUES),
+    "maritalStatus": Field("text"),
+    "has_children": Field("integer"),
+    "education": Field("choice", tuple(ORDINAL_MAPPINGS["education"])),
+    "occupation": Field("text"),
+    "income": Field("choice", tuple(ORDINAL_MAPPINGS["income"])),
+    "Bar": Field("choice", FREQUENCIES),
+    "CoffeeHouse": Field("choice", FREQUENCIES),
+    "CarryAway": Field("choice", FREQUENCIES),
+    "RestaurantLessThan20": Field("choice", FREQUENCIES, required=False),
+    "Restaurant20To50": Field("choice", FREQUENCIES),
+    "toCoupon_GEQ15min": Field("integer"),
+    "toCoupon_GEQ25min": Field("integer"),
+    "direction_same": Field("integer"),
+}
+
+
+class SchemaError(ValueError):
+    """A request failed validation; ``errors`` maps each bad field to what is wrong with it."""
+
+    def __init__(self, errors: dict[str, str]) -> None:
+        self.errors = errors
+        super().__init__("Invalid request: " + "; ".join(f"{name!r} {message}" for name, message in errors.items()))
+
+
+def _type_name(value: Any) -> str:
+    return type(value).__name__
+
+
+def _compile(field: Field) -> Callable[[Any], str | None]:
+    """A check returning an error message for a bad value, or None."""
+    if field.kind == "text":
+        return lambda value: None if isinstance(value, str) else f"must be a string, got {_type_name(value)}"
+
+    if field.kind == "integer":
+
+        def check_integer(value: Any) -> str | None:
+            if isinstance(value, int) and not isinstance(value, bool):
+                return None
+            if isinstance(value, str) and value.lstrip("-").isdigit():
+                return None
+            return f"must be an integer, got {_type_name(value)}"
+
+        return check_integer
+
+    if field.kind == "choice":
+        allowed = frozenset(field.choices)
+        message = "must be one of " + ", ".join(repr(choice) for choice in field.choices)
+
+        def check_choice(value: Any) -> str | None:
+            # Ints are compared as text so e.g. age 21 matches "21".
+            if isinstance(value, (str, int)) and not isinstance(value, bool) and str(value) in allowed:
+                return None
+            return message
+
+        return check_choice
+
+    raise ValueError(f"Unknown field kind: {field.kind!r}")
+
+
+_MISSING = object()
+
+
+class RequestValidator:
+    """A schema compiled into one check per field.
+
+    ``validate`` makes a single pass over the schema and reports every bad
+    field at once, without building any features.
+    """
+
+    def __init__(self, schema: Mapping[str, Field]) -> None:
+        self._checks = [(name, field.required, _compile(field)) for name, field in schema.items()]
+
+    def validate(self, payload: Any) -> None:
+        if not isinstance(payload, Mapping):
+            raise ValueError("Request JSON must be an object/dictionary")
+        errors = {}
+        for name, required, check in self._checks:
+            value = payload.get(name, _MISSING)
+            if value is _MISSING:
+                if required:
+                    errors[name] = "is required"
+            elif value is not None:
+                message = check(value)
+                if message is not None:
+                    errors[name] = message
+        if errors:
+            raise SchemaError(errors)
+
+
+_validator = RequestValidator(REQUEST_SCHEMA)
+
+
+def validate_request(payload: Any) -> None:
+    """Check one request body against ``REQUEST_SCHEMA``; raise ``SchemaError`` if it is invalid."""
+    _validator.validate(payload)
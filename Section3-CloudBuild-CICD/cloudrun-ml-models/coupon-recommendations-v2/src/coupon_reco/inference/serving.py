@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Mapping
+
+import numpy as np
+
+from coupon_reco import metrics
+from coupon_reco.config import Settings
+from coupon_reco.inference.batcher import get_batcher
+from coupon_reco.inference.cache import PredictionCache, get_prediction_cache
+from coupon_reco.inference.features import COUPON_VALUES
+from coupon_reco.inference.predictor import load_model, predict, predict_proba
+from coupon_reco.inference.schema import validate_request
+
+
+def predict_payload(settings: Settings, payload: Any) -> list[Any]:
+    """Score one ``/predict`` request body.
+
+    Shared by the Flask and ASGI apps: prediction cache lookup, the feature
+    plan, then the micro-batcher or a direct ``model.predict`` call. Raises
+    ``SchemaError`` for payloads that do not match the request schema and
+    ``Overloaded`` when the micro-batch queue is full.
+    """
+    validate_request(payload)
+    bundle = load_model(settings)
+
+    cache = get_prediction_cache(settings)
+    if cache is not None:
+        key = PredictionCache.key(payload)
+        preds = cache.get(key, bundle.version)
+        if preds is not None:
+            return preds
+
+    start = time.perf_counter()
+    feats = bundle.plan.transform_one(payload)
+    metrics.observe(metrics.PREPROCESS_SECONDS, time.perf_counter() - start)
+    if settings.BATCHING_ENABLED:
+        preds = get_batcher(settings).predict(bundle, feats)
+    else:
+        preds = predict(bundle, feats)
+
+    if cache is not None:
+        cache.put(key, bundle.version, preds)
+    return preds
+
+
+def parse_top_k(raw: str | None) -> int | None:
+    """``k`` query parameter: a positive integer, or all coupons when absent."""
+    if raw is None:
+        return None
+    try:
+        k = int(raw)
+    except ValueError:
+        k = 0
+    if k < 1:
+        raise ValueError(f"k must be a positive integer, got {raw!r}")
+    return k
+
+
+def rank_payload(settings: Settings, payload: Any, k: int | None = None) -> list[dict[str, Any]]:
+    """Rank every coupon type for one ``/rank`` context, most likely accepted first.
+
+    The context is expanded to one row per ``COUPON_VALUES`` entry (any
+    ``coupon`` in it is ignored) and scored in a single ``predict_proba``
+    call; the best ``k`` are returned with their probabilities.
+    """
+    if not isinstance(payload, Mapping):
+        raise ValueError("Request JSON must be an object/dictionary")
+    validate_request({**payload, "coupon": COUPON_VALUES[0]})
+    bundle = load_model(settings)
+
+    start = time.perf_counter()
+    feats = bundle.plan.transform_variants(payload, "coupon", COUPON_VALUES)
+    metrics.observe(metrics.PREPROCESS_SECONDS, time.perf_counter() - start)
+    proba = predict_proba(bundle, feats)
+
+    order = np.argsort(-proba, kind="stable")[:k]
+    return [{"coupon": COUPON_VALUES[i], "probability": float(proba[i])} for i in order]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.batcher import get_batcher
+from coupon_reco.inference.predictor import load_model, predict
+
+logger = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """Load the model and run a synthetic prediction before taking traffic.
+
+    ``/readyz`` reports not-ready until ``done`` is set, so Cloud Run only
+    routes requests to the instance once the artifact is downloaded,
+    unpickled and the first XGBoost call has run.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.done = threading.Event()
+        self.error: Exception | None = None
+        self.timings: dict[str, float] = {}
+
+    def start(self) -> threading.Thread:
+        """Run in a background thread so /healthz answers during warm-up."""
+        thread = threading.Thread(target=self.run, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        try:
+            bundle = load_model(self.settings)
+            self.timings.update(bundle.load_timings)
+
+            first = time.perf_counter()
+            predict(bundle, np.zeros((1, len(bundle.plan.columns)), dtype=np.float32))
+            self.timings["first_predict_s"] = time.perf_counter() - first
+
+            if self.settings.BATCHING_ENABLED:
+                get_batcher(self.settings)
+        except Exception as e:
+            self.error = e
+            logger.exception("Model warm-up failed")
+        else:
+            self.timings["total_s"] = time.perf_counter() - start
+            logger.info(
+                "Model warm-up finished in %.3fs",
+                self.timings["total_s"],
+                extra={"startup": {k: round(v, 6) for k, v in self.timings.items()}},
+            )
+        finally:
+            self.done.set()
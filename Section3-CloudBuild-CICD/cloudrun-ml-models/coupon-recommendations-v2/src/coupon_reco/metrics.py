@@ -0,0 +1,113 @@
+"""Prometheus metrics for the serving path.
+
+Metrics live in a private registry exposed on /metrics. Recording is a
+``perf_counter`` pair and one ``observe`` call per stage, and is skipped
+entirely when METRICS_ENABLED is off. Cache and micro-batcher counters are
+read from their ``stats()`` at scrape time instead of on every request.
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SIZE_BUCKETS = (256, 512, 1024, 2048, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+_ROW_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1000, 2000, 5000, 10000)
+
+REGISTRY = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "coupon_reco_request_latency_seconds",
+    "HTTP request latency.",
+    ["endpoint", "status"],
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+PREPROCESS_SECONDS = Histogram(
+    "coupon_reco_preprocess_seconds",
+    "Time to turn request payloads into a feature matrix.",
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+INFERENCE_SECONDS = Histogram(
+    "coupon_reco_inference_seconds",
+    "Time spent in model.predict per call.",
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+PAYLOAD_BYTES = Histogram(
+    "coupon_reco_payload_bytes",
+    "Request body size.",
+    ["endpoint"],
+    buckets=_SIZE_BUCKETS,
+    registry=REGISTRY,
+)
+BATCH_SIZE = Histogram(
+    "coupon_reco_batch_size_rows",
+    "Rows scored per model.predict call.",
+    buckets=_ROW_BUCKETS,
+    registry=REGISTRY,
+)
+
+_enabled = False
+
+
+def configure_metrics(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def observe(histogram: Histogram, value: float, *labels: str) -> None:
+    """Record ``value`` if metrics are enabled."""
+    if _enabled:
+        (histogram.labels(*labels) if labels else histogram).observe(value)
+
+
+class _ServingStatsCollector:
+    """Export prediction cache and micro-batcher counters at scrape time."""
+
+    def describe(self) -> list[Metric]:
+        return []
+
+    def collect(self) -> Iterator[Metric]:
+        # Imported here: both modules import the predictor, which imports this module.
+        from coupon_reco.config import Settings
+        from coupon_reco.inference.batcher import get_batcher
+        from coupon_reco.inference.cache import get_prediction_cache
+
+        settings = Settings()
+        cache = get_prediction_cache(settings)
+        if cache is not None:
+            stats = cache.stats()
+            lookups = CounterMetricFamily(
+                "coupon_reco_prediction_cache_lookups", "Prediction cache lookups.", labels=["result"]
+            )
+            lookups.add_metric(["hit"], stats["hits"])
+            lookups.add_metric(["miss"], stats["misses"])
+            yield lookups
+            yield GaugeMetricFamily("coupon_reco_prediction_cache_size", "Cached predictions.", value=stats["size"])
+
+        if settings.BATCHING_ENABLED:
+            stats = get_batcher(settings).stats()
+            yield GaugeMetricFamily(
+                "coupon_reco_batcher_queue_depth", "Submissions waiting for the micro-batcher.", value=stats["queue_depth"]
+            )
+            yield CounterMetricFamily(
+                "coupon_reco_batcher_rejected", "Submissions rejected because the queue was full.", value=stats["rejected"]
+            )
+
+
+REGISTRY.register(_ServingStatsCollector())
+
+
+def render() -> bytes:
+    """Current metrics in the Prometheus text format."""
+    return generate_latest(REGISTRY)
@@ -0,0 +1,35 @@
+"""A sample request shared by the tests and benchmarks, plus small helpers."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+SAMPLE_PAYLOAD: dict[str, Any] = {
+    "destination": "No Urgent Place",
+    "passanger": "Kid(s)",
+    "weather": "Sunny",
+    "temperature": 80,
+    "time": "10AM",
+    "coupon": "Bar",
+    "expiration": "1d",
+    "gender": "Female",
+    "age": "21",
+    "maritalStatus": "Unmarried partner",
+    "has_children": 1,
+    "education": "Some college - no degree",
+    "occupation": "Unemployed",
+    "income": "$37500 - $49999",
+    "Bar": "never",
+    "CoffeeHouse": "never",
+    "CarryAway": "4~8",
+    "RestaurantLessThan20": "4~8",
+    "Restaurant20To50": "1~3",
+    "toCoupon_GEQ15min": 1,
+    "toCoupon_GEQ25min": 0,
+    "direction_same": 0,
+}
+
+
+def ndjson(text: str) -> list[Any]:
+    """Parse an NDJSON response body into a list of objects."""
+    return [json.loads(line) for line in text.splitlines()]
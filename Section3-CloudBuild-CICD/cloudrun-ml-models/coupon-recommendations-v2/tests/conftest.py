@@ -0,0 +1,19 @@
+"""Fixtures shared by the test modules."""
+import pytest
+
+from coupon_reco.app import create_app
+from coupon_reco.testing import SAMPLE_PAYLOAD
+
+
+@pytest.fixture
+def valid_payload():
+    """A complete, valid /predict body (a fresh copy per test)."""
+    return dict(SAMPLE_PAYLOAD)
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.testing = True
+    with app.test_client() as client:
+        yield client
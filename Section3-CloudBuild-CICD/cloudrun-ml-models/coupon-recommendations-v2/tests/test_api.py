@@ -1,8 +1,9 @@
-import os
+import json
 
 import pytest
 
 from coupon_reco.app import create_app
+from coupon_reco.testing import ndjson
 
 
 @pytest.fixture(autouse=True)
@@ -11,46 +12,14 @@ def _set_model_uri(monkeypatch):
     monkeypatch.setenv("MODEL_URI", "artifacts/xgboost_coupon_recommendation.pkl")
 
 
-@pytest.fixture
-def client():
-    app = create_app()
-    app.testing = True
-    with app.test_client() as client:
-        yield client
-
-
 def test_healthz(client):
     r = client.get("/healthz")
     assert r.status_code == 200
     assert r.json == {"status": "ok"}
 
 
-def test_predict_success(client):
-    input_data = {
-        "destination": "No Urgent Place",
-        "passanger": "Kid(s)",
-        "weather": "Sunny",
-        "temperature": 80,
-        "time": "10AM",
-        "coupon": "Bar",
-        "expiration": "1d",
-        "gender": "Female",
-        "age": "21",
-        "maritalStatus": "Unmarried partner",
-        "has_children": 1,
-        "education": "Some college - no degree",
-        "occupation": "Unemployed",
-        "income": "$37500 - $49999",
-        "Bar": "never",
-        "CoffeeHouse": "never",
-        "CarryAway": "4~8",
-        "RestaurantLessThan20": "4~8",
-        "Restaurant20To50": "1~3",
-        "toCoupon_GEQ15min": 1,
-        "toCoupon_GEQ25min": 0,
-        "direction_same": 0,
-    }
-    r = client.post("/predict", json=input_data)
+def test_predict_success(client, valid_payload):
+    r = client.post("/predict", json=valid_payload)
     assert r.status_code == 200
     assert "predictions" in r.json
     assert r.json["predictions"][0] in [0, 1]
@@ -62,3 +31,191 @@ def test_predict_failure_bad_shape(client):
     r = client.post("/predict", json=input_data)
     assert r.status_code == 400
     assert "error" in r.json
+    assert r.json["fields"]["destination"] == "must be a string, got list"
+    assert r.json["fields"]["weather"] == "is required"
+
+
+def test_predict_batch_json_array_reports_row_errors(client, valid_payload):
+    records = [valid_payload, {**valid_payload, "time": "noon"}, valid_payload]
+    r = client.post("/predict:batch", json=records)
+    assert r.status_code == 200
+    assert r.mimetype == "application/x-ndjson"
+
+    results = ndjson(r.get_data(as_text=True))
+    assert [res["index"] for res in results] == [0, 1, 2]
+    assert results[0]["prediction"] in [0, 1]
+    assert "time" in results[1]["error"]
+    assert results[2]["prediction"] == results[0]["prediction"]
+
+
+def test_predict_batch_ndjson_stream(client, valid_payload):
+    body = "\n".join([json.dumps(valid_payload), "{not json", "", json.dumps(valid_payload)]) + "\n"
+    r = client.post("/predict:batch", data=body, content_type="application/x-ndjson")
+    assert r.status_code == 200
+
+    results = ndjson(r.get_data(as_text=True))
+    assert len(results) == 3
+    assert "Invalid JSON line" in results[1]["error"]
+    assert results[2]["prediction"] in [0, 1]
+
+
+def test_predict_batch_rejects_non_array(client, valid_payload):
+    r = client.post("/predict:batch", json=valid_payload)
+    assert r.status_code == 400
+    assert "error" in r.json
+
+
+def test_statsz_counts_batched_predictions(client, monkeypatch, valid_payload):
+    from coupon_reco.api import routes
+    from coupon_reco.config import Settings
+
+    # Settings defaults are read at import, so enable micro-batching for the routes directly.
+    monkeypatch.setattr(routes, "Settings", lambda: Settings(BATCHING_ENABLED=True))
+    before = client.get("/statsz").json
+    assert client.post("/predict", json=valid_payload).status_code == 200
+    assert client.post("/predict", json={**valid_payload, "temperature": 30}).status_code == 200
+    r = client.get("/statsz")
+    after = r.json
+
+    assert r.status_code == 200
+    # Sequential requests each get their own one-row batch.
+    assert after["batcher"]["batches"] - before["batcher"]["batches"] == 2
+    assert after["batcher"]["rows"] - before["batcher"]["rows"] == 2
+    assert after["batcher"]["last_batch_size"] == 1
+    assert after["batcher"]["rejected"] == 0
+
+
+def test_predict_overloaded_returns_503(client, monkeypatch, valid_payload):
+    from coupon_reco.api import routes
+    from coupon_reco.inference.batcher import Overloaded
+
+    def overloaded(settings, payload):
+        raise Overloaded("Micro-batch queue is full")
+
+    monkeypatch.setattr(routes, "predict_payload", overloaded)
+    r = client.post("/predict", json=valid_payload)
+    assert r.status_code == 503
+    assert r.json == {"error": "overloaded"}
+    assert r.headers["Retry-After"] == "1"
+
+
+def test_readyz_waits_for_warmup(monkeypatch):
+    import threading
+
+    from coupon_reco.inference import warmup as warmup_module
+
+    release = threading.Event()
+    real_load_model = warmup_module.load_model
+
+    def slow_load_model(settings):
+        release.wait(5)
+        return real_load_model(settings)
+
+    monkeypatch.setattr(warmup_module, "load_model", slow_load_model)
+    app = create_app(preload=True)
+    client = app.test_client()
+
+    r = client.get("/readyz")
+    assert r.status_code == 503
+    assert r.json == {"status": "warming_up"}
+
+    release.set()
+    warmup = app.extensions["warmup"]
+    assert warmup.done.wait(10)
+    assert warmup.error is None
+    assert {"model_download_s", "model_deserialize_s", "first_predict_s"} <= set(warmup.timings)
+    assert client.get("/readyz").status_code == 200
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch):
+    from coupon_reco import config
+    from coupon_reco.api import routes
+
+    # The cache is off by default and Settings defaults are read at import.
+    settings = config.Settings(PREDICTION_CACHE_SIZE=64)
+    monkeypatch.setattr(routes, "Settings", lambda: settings)
+    monkeypatch.setattr(config, "Settings", lambda: settings)
+
+
+def test_repeated_predict_hits_cache(client, cache_enabled, valid_payload):
+    payload = {**valid_payload, "temperature": 30}
+    before = client.get("/statsz").json["cache"]
+    first = client.post("/predict", json=payload)
+    second = client.post("/predict", json=dict(reversed(list(payload.items()))))
+    after = client.get("/statsz").json["cache"]
+
+    assert first.json == second.json
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["size"] - before["size"] == 1
+    assert 'coupon_reco_prediction_cache_lookups_total{result="hit"}' in client.get("/metrics").data.decode()
+
+
+def test_cache_is_off_by_default(client):
+    assert "cache" not in client.get("/statsz").json
+
+
+def test_metrics_exposes_stage_histograms(client, valid_payload):
+    client.post("/predict", json={**valid_payload, "temperature": 55})
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.mimetype == "text/plain"
+
+    body = r.data.decode()
+    for name in [
+        'coupon_reco_request_latency_seconds_count{endpoint="/predict",status="200"}',
+        "coupon_reco_preprocess_seconds_count",
+        "coupon_reco_inference_seconds_count",
+        'coupon_reco_payload_bytes_count{endpoint="/predict"}',
+        "coupon_reco_batch_size_rows_count",
+    ]:
+        assert name in body
+
+
+def test_fork_hooks_preload_model_and_restart_threads():
+    import gc
+
+    from coupon_reco.app import prepare_fork, restart_after_fork
+    from coupon_reco.config import Settings
+    from coupon_reco.inference.batcher import get_batcher
+    from coupon_reco.inference.reloader import ModelWatcher
+
+    app = create_app(preload=True)
+    old_watcher = app.extensions["model_watcher"] = ModelWatcher(Settings(), 60)
+    batcher = get_batcher(Settings())
+    try:
+        prepare_fork(app)
+        assert app.extensions["warmup"].done.is_set()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+    restart_after_fork(app)
+    watcher = app.extensions["model_watcher"]
+    try:
+        assert watcher is not old_watcher and watcher._thread.is_alive()
+        assert get_batcher(Settings()) is not batcher
+    finally:
+        watcher.stop()
+
+
+def test_rank_orders_all_coupons_by_probability(client, valid_payload):
+    from coupon_reco.config import Settings
+    from coupon_reco.inference.features import COUPON_VALUES
+    from coupon_reco.inference.predictor import load_model
+
+    r = client.post("/rank", json=valid_payload)
+    assert r.status_code == 200
+    ranking = r.json["ranking"]
+    assert sorted(item["coupon"] for item in ranking) == sorted(COUPON_VALUES)
+    probabilities = [item["probability"] for item in ranking]
+    assert probabilities == sorted(probabilities, reverse=True)
+
+    bundle = load_model(Settings())
+    best = {**valid_payload, "coupon": ranking[0]["coupon"]}
+    assert bundle.model.predict_proba(bundle.plan.transform_one(best))[0, 1] == pytest.approx(probabilities[0])
+
+    top2 = client.post("/rank?k=2", json=valid_payload).json["ranking"]
+    assert top2 == ranking[:2]
+    assert client.post("/rank?k=0", json=valid_payload).status_code == 400
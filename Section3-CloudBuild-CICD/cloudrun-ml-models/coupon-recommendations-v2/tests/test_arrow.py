@@ -0,0 +1,57 @@
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from coupon_reco.inference.arrow import ARROW_STREAM_MIMETYPE, table_features
+from coupon_reco.inference.features import REQUEST_FIELDS, fit_template_encoder
+from coupon_reco.inference.plan import FeaturePlan
+
+TRAINING_CSV = Path(__file__).parents[1] / "training" / "data" / "in-vehicle-coupon-recommendation.csv"
+
+
+def arrow_stream(table: pa.Table, max_chunksize: int | None = None) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max_chunksize)
+    return sink.getvalue().to_pybytes()
+
+
+def test_table_features_match_row_plan_on_training_csv():
+    raw = pd.read_csv(TRAINING_CSV)[REQUEST_FIELDS]
+    plan = FeaturePlan.from_encoder(fit_template_encoder())
+    # Several record batches, so columns arrive as multi-chunk arrays.
+    table = pa.ipc.open_stream(arrow_stream(pa.Table.from_pandas(raw), max_chunksize=5000)).read_all()
+
+    np.testing.assert_array_equal(table_features(plan, table), plan.transform(raw.to_dict("records")))
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_predict_columnar_body_matches_json(client, fmt, valid_payload):
+    payloads = [valid_payload, {**valid_payload, "coupon": "Coffee House", "age": "50plus"}]
+    table = pa.Table.from_pylist(payloads)
+    if fmt == "arrow":
+        body, mimetype = arrow_stream(table), ARROW_STREAM_MIMETYPE
+    else:
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        body, mimetype = buffer.getvalue(), "application/vnd.apache.parquet"
+
+    r = client.post("/predict", data=body, content_type=mimetype)
+    assert r.status_code == 200
+    assert r.mimetype == ARROW_STREAM_MIMETYPE
+    preds = pa.ipc.open_stream(r.data).read_all().column("prediction").to_pylist()
+
+    expected = [client.post("/predict", json=p).json["predictions"][0] for p in payloads]
+    assert preds == expected
+
+
+def test_predict_columnar_missing_column(client, valid_payload):
+    table = pa.Table.from_pylist([{k: v for k, v in valid_payload.items() if k != "coupon"}])
+    r = client.post("/predict", data=arrow_stream(table), content_type=ARROW_STREAM_MIMETYPE)
+    assert r.status_code == 400
+    assert r.json["error"] == "Missing field: 'coupon'"
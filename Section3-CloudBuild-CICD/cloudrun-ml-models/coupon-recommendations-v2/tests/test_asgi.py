@@ -0,0 +1,39 @@
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from coupon_reco.asgi import create_app
+from coupon_reco.testing import ndjson
+
+
+@pytest.fixture
+def client():
+    with TestClient(create_app(preload=False)) as client:
+        yield client
+
+
+def test_predict_matches_flask_contract(client, valid_payload):
+    r = client.post("/predict", json=valid_payload)
+    assert r.status_code == 200
+    assert r.json()["predictions"] in ([0], [1])
+
+    r = client.post("/predict", json={"passanger": "Alone"})
+    assert r.status_code == 400
+    assert r.json()["fields"]["destination"] == "is required"
+
+
+def test_predict_batch_streams_ndjson(client, valid_payload):
+    body = "\n".join([json.dumps(valid_payload), "{not json", json.dumps(valid_payload)])
+    r = client.post("/predict:batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200
+    lines = ndjson(r.text)
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert "prediction" in lines[0] and "error" in lines[1] and "prediction" in lines[2]
+
+
+def test_rejects_requests_past_pending_limit(client, valid_payload):
+    client.app.state.pending = client.app.state.max_pending
+    r = client.post("/predict", json=valid_payload)
+    assert r.status_code == 503
+    assert r.json() == {"error": "overloaded"}
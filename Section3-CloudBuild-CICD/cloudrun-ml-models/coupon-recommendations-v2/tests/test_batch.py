@@ -0,0 +1,15 @@
+from coupon_reco.config import Settings
+from coupon_reco.inference.batch import score_records
+from coupon_reco.inference.predictor import load_model
+
+
+def test_score_records_keeps_order_across_chunks(valid_payload):
+    bundle = load_model(Settings(MODEL_URI="artifacts/xgboost_coupon_recommendation.pkl"))
+    records = [valid_payload, ValueError("bad line"), {"destination": "Home"}, valid_payload, valid_payload]
+
+    results = list(score_records(bundle, records, chunk_size=2))
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert [("prediction" in r) for r in results] == [True, False, False, True, True]
+    assert results[1]["error"] == "bad line"
+    assert "'passanger' is required" in results[2]["error"]
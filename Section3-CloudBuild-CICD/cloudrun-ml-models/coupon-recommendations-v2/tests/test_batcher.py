@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+import pytest
+
+from coupon_reco.inference.batcher import MicroBatcher, Overloaded
+
+
+def test_concurrent_submissions_share_model_calls():
+    calls = []
+
+    def predict_fn(model, features):
+        calls.append(len(features))
+        return features[:, 0].tolist()
+
+    batcher = MicroBatcher(predict_fn, max_rows=64, max_wait_ms=50)
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher.predict("model", np.array([[float(i), 0.0]]))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: [float(i)] for i in range(8)}
+    assert sum(calls) == 8
+    assert len(calls) < 8
+    stats = batcher.stats()
+    assert stats["rows"] == 8
+    assert stats["max_batch_size"] == max(calls)
+
+
+def test_failed_batch_raises_in_every_caller():
+    def predict_fn(model, features):
+        raise RuntimeError("model exploded")
+
+    batcher = MicroBatcher(predict_fn, max_rows=4, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="model exploded"):
+        batcher.predict("model", np.zeros((1, 2)))
+
+
+def test_each_batch_is_scored_by_the_submitted_model():
+    calls = []
+
+    def predict_fn(model, features):
+        calls.append((model, len(features)))
+        return [model] * len(features)
+
+    batcher = MicroBatcher(predict_fn, max_rows=64, max_wait_ms=50)
+    futures = [batcher.submit(model, np.zeros((1, 2))) for model in ["v1", "v2", "v1", "v2", "v2"]]
+
+    assert [f.result() for f in futures] == [["v1"], ["v2"], ["v1"], ["v2"], ["v2"]]
+    assert sorted(calls) == [("v1", 2), ("v2", 3)]
+
+
+def test_full_queue_rejects_submissions():
+    release = threading.Event()
+
+    def predict_fn(model, features):
+        release.wait()
+        return [0] * len(features)
+
+    batcher = MicroBatcher(predict_fn, max_rows=1, max_wait_ms=0, max_queue=1)
+    first = batcher.submit("model", np.zeros((1, 2)))
+    while batcher.stats()["queue_depth"]:  # wait for the worker to take it
+        pass
+    queued = batcher.submit("model", np.zeros((1, 2)))
+    with pytest.raises(Overloaded):
+        batcher.submit("model", np.zeros((1, 2)))
+    release.set()
+
+    assert first.result() == [0] and queued.result() == [0]
+    assert batcher.stats()["rejected"] == 1
@@ -0,0 +1,25 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.booster import BoosterModel
+from coupon_reco.inference.predictor import load_model, predict
+
+PICKLE_URI = "artifacts/xgboost_coupon_recommendation.pkl"
+
+
+@pytest.mark.parametrize("suffix", [".bst", ".json", ".ubj"])
+def test_native_formats_match_pickled_classifier(tmp_path, suffix):
+    with open(PICKLE_URI, "rb") as f:
+        classifier = pickle.load(f)
+    model_path = tmp_path / f"model{suffix}"
+    classifier.get_booster().save_model(str(model_path))
+
+    bundle = load_model(Settings(MODEL_URI=str(model_path)))
+    features = np.random.default_rng(0).integers(0, 4, size=(200, 39)).astype(np.float32)
+
+    assert isinstance(bundle.model, BoosterModel)
+    assert predict(bundle, features) == classifier.predict(features).tolist()
+    np.testing.assert_allclose(bundle.model.predict_proba(features), classifier.predict_proba(features), rtol=1e-6)
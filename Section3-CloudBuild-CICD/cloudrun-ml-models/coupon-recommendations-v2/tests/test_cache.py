@@ -0,0 +1,43 @@
+from coupon_reco.inference.cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_field_order():
+    assert PredictionCache.key({"a": 1, "b": "x"}) == PredictionCache.key({"b": "x", "a": 1})
+    assert PredictionCache.key({"a": 1}) != PredictionCache.key({"a": 2})
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(max_entries=2, ttl_s=10, clock=clock)
+    cache.put("a", "v1", [1])
+    cache.put("b", "v1", [0])
+    assert cache.get("a", "v1") == [1]  # "a" is now most recently used
+
+    cache.put("c", "v1", [1])
+    assert cache.get("b", "v1") is None
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a", "v1") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_are_kept_per_model_version():
+    cache = PredictionCache(max_entries=2, ttl_s=60)
+    cache.put("a", "v1", [1])
+    assert cache.get("a", "v2") is None
+    cache.put("a", "v2", [0])
+    assert cache.get("a", "v1") == [1] and cache.get("a", "v2") == [0]
+
+    # Old-version entries are not dropped up front; they age out like any other.
+    cache.put("b", "v2", [1])
+    assert cache.get("a", "v1") is None
+    assert cache.stats()["size"] == 2 and cache.evictions == 1
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from coupon_reco.cli import main
+from coupon_reco.config import Settings
+from coupon_reco.inference.features import REQUEST_FIELDS
+from coupon_reco.inference.predictor import load_model, predict
+
+TRAINING_CSV = Path(__file__).parents[1] / "training" / "data" / "in-vehicle-coupon-recommendation.csv"
+
+
+@pytest.fixture(scope="module")
+def expected():
+    # What /predict returns for each row sent as JSON.
+    raw = pd.read_csv(TRAINING_CSV)
+    bundle = load_model(Settings())
+    return predict(bundle, bundle.plan.transform(raw[REQUEST_FIELDS].to_dict("records")))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_csv_matches_service_predictions(tmp_path, expected, workers):
+    out = tmp_path / "scored.csv"
+    args = ["score", str(TRAINING_CSV), str(out), "--chunk-size", "1000", "--workers", str(workers)]
+    assert main(args) == 0
+
+    scored = pd.read_csv(out)
+    assert scored["row"].tolist() == list(range(len(expected)))
+    assert scored["prediction"].tolist() == expected
+
+
+def test_score_parquet_keeps_columns(tmp_path, expected):
+    source = tmp_path / "input.parquet"
+    pd.read_csv(TRAINING_CSV).head(500).to_parquet(source)
+    out = tmp_path / "scored.parquet"
+
+    assert main(["score", str(source), str(out), "--chunk-size", "128", "--workers", "1", "--keep", "coupon"]) == 0
+    scored = pq.read_table(out)
+    assert scored.column_names == ["row", "coupon", "prediction"]
+    assert scored.column("prediction").to_pylist() == expected[:500]
+
+
+def test_score_reports_bad_chunk(tmp_path):
+    source = tmp_path / "input.csv"
+    pd.read_csv(TRAINING_CSV).head(10).drop(columns=["coupon"]).to_csv(source, index=False)
+    assert main(["score", str(source), str(tmp_path / "out.csv"), "--workers", "1"]) == 1
@@ -0,0 +1,10 @@
+import pandas as pd
+
+from coupon_reco.inference.features import encode_features, fit_template_encoder, preprocess_data
+
+
+def test_fitted_encoder_matches_per_request_fit(valid_payload):
+    x = preprocess_data(pd.DataFrame(valid_payload, index=[0]))
+    refit = encode_features(x)
+    fitted = encode_features(x, encoder=fit_template_encoder())
+    pd.testing.assert_frame_equal(refit, fitted)
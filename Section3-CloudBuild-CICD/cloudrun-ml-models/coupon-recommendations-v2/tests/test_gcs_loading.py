@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from coupon_reco.config import Settings
+from coupon_reco.inference import predictor
+from coupon_reco.inference.predictor import load_model, reload_model
+
+
+class FakeBlob:
+    def __init__(self, store, name, generation=None):
+        self.store = store
+        self.name = name
+        self.generation = generation
+
+    def download_as_bytes(self):
+        generation, data = self.store.objects[self.name]
+        assert self.generation == generation, "download must be pinned to the listed generation"
+        self.store.downloads += 1
+        return data
+
+
+class FakeBucket:
+    def __init__(self, store):
+        self.store = store
+
+    def get_blob(self, name):
+        if name not in self.store.objects:
+            return None
+        return FakeBlob(self.store, name, self.store.objects[name][0])
+
+    def blob(self, name, generation=None):
+        return FakeBlob(self.store, name, generation)
+
+
+class FakeClient:
+    def __init__(self):
+        self.objects = {}
+        self.downloads = 0
+
+    def bucket(self, name):
+        return FakeBucket(self)
+
+
+@pytest.fixture
+def gcs(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(predictor, "_storage_client", lambda project=None: client)
+    return client
+
+
+def test_load_model_streams_gcs_blob_into_memory(gcs):
+    with open("artifacts/xgboost_coupon_recommendation.pkl", "rb") as f:
+        gcs.objects["models/model.pkl"] = (7, f.read())
+
+    bundle = load_model(Settings(MODEL_URI="gs://bucket/models/model.pkl"))
+
+    assert bundle.generation == "7"
+    assert gcs.downloads == 1
+
+
+def test_disk_cache_skips_download_for_same_generation(gcs, tmp_path):
+    gcs.objects["m.pkl"] = (1, pickle.dumps({"v": 1}))
+    uri = "gs://bucket/m.pkl"
+
+    assert predictor._read_artifact(uri, cache_dir=str(tmp_path)) == pickle.dumps({"v": 1})
+    assert predictor._read_artifact(uri, cache_dir=str(tmp_path)) == pickle.dumps({"v": 1})
+    assert gcs.downloads == 1
+
+    gcs.objects["m.pkl"] = (2, pickle.dumps({"v": 2}))
+    assert pickle.loads(predictor._read_artifact(uri, cache_dir=str(tmp_path))) == {"v": 2}
+    assert gcs.downloads == 2
+    assert [p.name.split("-")[1] for p in tmp_path.iterdir()] == ["2.pkl"]
+
+
+def test_reload_uses_cached_generation(gcs, tmp_path):
+    with open("artifacts/xgboost_coupon_recommendation.pkl", "rb") as f:
+        gcs.objects["model.pkl"] = (3, f.read())
+    settings = Settings(MODEL_URI="gs://bucket/model.pkl", MODEL_CACHE_DIR=str(tmp_path))
+
+    load_model(settings)
+    reload_model(settings)
+
+    assert gcs.downloads == 1
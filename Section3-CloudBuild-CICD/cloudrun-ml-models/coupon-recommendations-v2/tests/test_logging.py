@@ -0,0 +1,14 @@
+import json
+import logging
+
+from coupon_reco.logging import JsonFormatter
+
+
+def test_json_formatter_emits_extra_fields():
+    record = logging.makeLogRecord(
+        {"name": "x", "levelname": "INFO", "msg": "warm %s", "args": ("up",), "startup": {"total_s": 1.5}}
+    )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["severity"] == "INFO"
+    assert entry["message"] == "warm up"
+    assert entry["startup"] == {"total_s": 1.5}
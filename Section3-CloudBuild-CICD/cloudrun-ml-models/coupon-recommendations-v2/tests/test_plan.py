@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from coupon_reco.inference.features import (
+    REQUEST_FIELDS,
+    encode_features,
+    fit_template_encoder,
+    preprocess_data,
+    preprocess_request,
+)
+from coupon_reco.inference.plan import FeaturePlan
+
+TRAINING_CSV = Path(__file__).parents[1] / "training" / "data" / "in-vehicle-coupon-recommendation.csv"
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(TRAINING_CSV)[REQUEST_FIELDS]
+
+
+@pytest.fixture(scope="module")
+def encoder():
+    return fit_template_encoder()
+
+
+def test_plan_matches_pandas_path_on_training_csv(raw, encoder):
+    expected = encode_features(preprocess_data(raw), encoder=encoder).fillna(0)
+
+    # preprocess_data mode-fills and de-duplicates the whole frame; feed the
+    # plan the same rows so both sides see identical inputs.
+    rows = raw.fillna(raw.mode().iloc[0]).drop_duplicates().to_dict("records")
+    plan = FeaturePlan.from_encoder(encoder)
+    actual = plan.transform(rows)
+
+    assert plan.columns == list(expected.columns)
+    np.testing.assert_array_equal(actual, expected.to_numpy(dtype=np.float32))
+
+
+def test_plan_matches_single_row_requests_with_missing_values(raw, encoder):
+    plan = FeaturePlan.from_encoder(encoder)
+    sample = raw[raw.isna().any(axis=1)].head(25).to_dict("records") + raw.head(25).to_dict("records")
+    sample.append({**sample[-1], "Bar": None, "occupation": None, "weather": None})
+
+    for payload in sample:
+        expected = preprocess_request(payload, encoder=encoder).to_numpy(dtype=np.float32)
+        np.testing.assert_array_equal(plan.transform_one(payload), expected)
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"time": "noon"}, "Unsupported value for 'time'"),
+        ({"destination": ["Home"]}, "must be a scalar"),
+        ({"direction_same": "yes"}, "must be numeric"),
+    ],
+)
+def test_plan_rejects_bad_values(raw, change, message):
+    payload = {**raw.iloc[0].to_dict(), **change}
+    with pytest.raises(ValueError, match=message):
+        FeaturePlan().transform_one(payload)
+
+
+def test_plan_rejects_missing_fields():
+    with pytest.raises(ValueError, match="Missing field"):
+        FeaturePlan().transform_one({"destination": "Home"})
+
+
+def test_transform_variants_matches_per_value_rows(raw):
+    plan = FeaturePlan()
+    context = {k: v for k, v in raw.iloc[0].to_dict().items() if k != "coupon"}
+    values = ["Bar", "Coffee House", "Restaurant(<20)", "Bar"]
+
+    expected = plan.transform([{**context, "coupon": value} for value in values])
+    np.testing.assert_array_equal(plan.transform_variants(context, "coupon", values), expected)
+    # Non-hashed fields take the general path.
+    np.testing.assert_array_equal(
+        plan.transform_variants({**context, "coupon": "Bar"}, "time", ["7AM", "6PM"]),
+        plan.transform([{**context, "coupon": "Bar", "time": t} for t in ["7AM", "6PM"]]),
+    )
+
+
+def test_bucket_table_gives_identical_hashed_columns(raw, encoder, monkeypatch):
+    hashing = FeaturePlan.from_encoder(encoder)
+    table = hashing.build_bucket_table(raw.to_dict("records"))
+    lookup = FeaturePlan.from_encoder(encoder, buckets=table)
+
+    rows = raw.to_dict("records")
+    rows.append({**rows[0], "occupation": "Astronaut", "weather": "Foggy"})
+    n = encoder.n_components
+    expected = hashing.transform(rows)
+
+    hashed = []
+    real_hash_bucket = lookup.hash_bucket
+    monkeypatch.setattr(lookup, "hash_bucket", lambda text: hashed.append(text) or real_hash_bucket(text))
+    np.testing.assert_array_equal(lookup.transform(rows)[:, :n], expected[:, :n])
+    # Only the values missing from the training data were hashed.
+    assert set(hashed) == {"Astronaut", f"{rows[0]['temperature']}-Foggy"}
+
+
+def test_load_model_reads_matching_bucket_table(tmp_path, encoder):
+    import json
+    import shutil
+
+    from coupon_reco.config import Settings
+    from coupon_reco.inference.predictor import load_model, reload_model
+
+    model_uri = tmp_path / "model.pkl"
+    shutil.copy(Settings().MODEL_URI, model_uri)
+    table = {"hash_method": "md5", "n_components": encoder.n_components, "buckets": {"Bar": 7}}
+    (tmp_path / "hash_buckets.json").write_text(json.dumps(table))
+
+    settings = Settings(MODEL_URI=str(model_uri))
+    assert load_model(settings).plan._buckets == {"Bar": 7}
+
+    (tmp_path / "hash_buckets.json").write_text(json.dumps({**table, "n_components": 8}))
+    assert reload_model(settings).plan._buckets == {}
@@ -0,0 +1,43 @@
+import os
+import pickle
+
+import numpy as np
+
+from coupon_reco.config import Settings
+from coupon_reco.inference.predictor import load_model, predict
+from coupon_reco.inference.reloader import ModelWatcher
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, features):
+        return np.full(len(features), self.value)
+
+
+def _write_model(path, model, mtime_ns):
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_watcher_swaps_in_new_local_artifact(tmp_path):
+    model_path = tmp_path / "model.pkl"
+    _write_model(model_path, ConstantModel(0), 1_000_000_000)
+    settings = Settings(MODEL_URI=str(model_path))
+    features = np.zeros((1, 39), dtype=np.float32)
+
+    old = load_model(settings)
+    watcher = ModelWatcher(settings, interval_s=60)
+    assert watcher.check() is False
+
+    _write_model(model_path, ConstantModel(1), 2_000_000_000)
+    assert watcher.check() is True
+
+    new = load_model(settings)
+    assert new.version != old.version
+    assert predict(new, features) == [1]
+    # A request that picked up the old bundle still finishes on it.
+    assert predict(old, features) == [0]
+    assert watcher.stats()["reloads"] == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from coupon_reco.inference.features import REQUEST_FIELDS
+from coupon_reco.inference.schema import REQUEST_SCHEMA, SchemaError, validate_request
+
+
+def test_schema_covers_request_fields_in_order():
+    assert list(REQUEST_SCHEMA) == REQUEST_FIELDS
+
+
+def test_valid_payloads_pass(valid_payload):
+    validate_request(valid_payload)
+    # Missing values, numeric strings, int ages and the optional unused fields.
+    relaxed = {**valid_payload, "Bar": None, "temperature": "80", "age": 21}
+    del relaxed["gender"], relaxed["RestaurantLessThan20"]
+    validate_request(relaxed)
+
+
+def test_reports_every_bad_field(valid_payload):
+    payload = {**valid_payload, "destination": ["Home"], "time": "noon", "has_children": 1.5, "age": True}
+    del payload["coupon"]
+
+    with pytest.raises(SchemaError) as info:
+        validate_request(payload)
+
+    assert info.value.errors == {
+        "destination": "must be a string, got list",
+        "time": "must be one of '7AM', '10AM', '2PM', '6PM', '10PM'",
+        "coupon": "is required",
+        "age": "must be one of 'below21', '21', '26', '31', '36', '41', '46', '50plus'",
+        "has_children": "must be an integer, got float",
+    }
+
+
+def test_rejects_non_object(valid_payload):
+    with pytest.raises(ValueError, match="must be an object"):
+        validate_request([valid_payload])
@@ -0,0 +1,50 @@
+"""Fit the serving HashingEncoder on the training data and save it.
+
+Run from the project root after training the model:
+
+    python training/build_encoder.py
+
+The service loads the result together with the model (see ENCODER_URI), so
+requests only call ``transform`` instead of fitting a new encoder each time.
+It also saves the hash bucket of every hashed value in the training data
+(see HASH_BUCKETS_URI), so known values are looked up instead of hashed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+
+import pandas as pd
+
+from coupon_reco.inference.features import REQUEST_FIELDS, fit_encoder, preprocess_data
+from coupon_reco.inference.plan import FeaturePlan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="training/data/in-vehicle-coupon-recommendation.csv")
+    parser.add_argument("--out", default="artifacts/hashing_encoder.pkl")
+    parser.add_argument("--buckets-out", default="artifacts/hash_buckets.json")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data, usecols=REQUEST_FIELDS)[REQUEST_FIELDS]
+    encoder = fit_encoder(preprocess_data(df))
+
+    with open(args.out, "wb") as f:
+        pickle.dump(encoder, f)
+    print(f"Saved encoder to {args.out}")
+
+    plan = FeaturePlan.from_encoder(encoder)
+    table = {
+        "hash_method": encoder.hash_method,
+        "n_components": encoder.n_components,
+        "buckets": plan.build_bucket_table(df.to_dict("records")),
+    }
+    with open(args.buckets_out, "w") as f:
+        json.dump(table, f, indent=1, sort_keys=True)
+    print(f"Saved {len(table['buckets'])} hash buckets to {args.buckets_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ from flask import Flask, request, jsonify
 from category_encoders import HashingEncoder
 import pickle
 import os
+import threading
+import time
 from google.cloud import storage
 
 app = Flask(__name__)
@@ -53,15 +55,84 @@ def _load_model():
     model = pickle.load(open(file_path, "rb"))
     return model
 
+MODEL_BLOB = os.environ.get("MODEL_BLOB", "ml-artifacts/xgboost_coupon_recommendation.pkl")
+
+# Model loading. This block is kept identical in coupon-recommendations/main.py
+# and coupon-recommendations-hpt/main.py (only MODEL_BLOB, above, differs);
+# change both together.
+MODEL_BUCKET = os.environ.get("MODEL_BUCKET", "sid-ml-ops")
+# Seconds between checks for a new model generation in GCS; 0 disables them.
+MODEL_REFRESH_INTERVAL = float(os.environ.get("MODEL_REFRESH_INTERVAL", 300))
+# Seconds between load attempts until the first load succeeds.
+MODEL_RETRY_INTERVAL = float(os.environ.get("MODEL_RETRY_INTERVAL", 10))
+
+storage_client = None
+model_generation = None
+model_lock = threading.Lock()
+refresh_thread = None
+
+class ModelNotReady(RuntimeError):
+    pass
+
+def _model_blob():
+    global storage_client
+    if storage_client is None:
+        storage_client = storage.Client()
+    blob = storage_client.bucket(MODEL_BUCKET).get_blob(MODEL_BLOB)
+    if blob is None:
+        raise FileNotFoundError(f"gs://{MODEL_BUCKET}/{MODEL_BLOB}")
+    return blob
+
+def refresh_model():
+    """Load the model if its GCS generation changed since the last load.
+
+    The pickle is downloaded into memory (the blob carries its generation, so
+    the bytes match it) and swapped in whole; nothing is written to disk.
+    """
+    global model, model_generation
+    with model_lock:
+        blob = _model_blob()
+        if blob.generation == model_generation:
+            return False
+        model = pickle.loads(blob.download_as_bytes())
+        model_generation = blob.generation
+        return True
+
+def _refresh_loop():
+    while True:
+        time.sleep(MODEL_RETRY_INTERVAL if model is None else MODEL_REFRESH_INTERVAL)
+        try:
+            if refresh_model():
+                app.logger.info("Loaded model generation %s", model_generation)
+        except Exception:
+            app.logger.exception("Model refresh failed; keeping generation %s", model_generation)
+        if model is not None and MODEL_REFRESH_INTERVAL <= 0:
+            return
+
+def start_model_loading():
+    """Load the model and start the background refresh thread.
+
+    A failed first load is logged instead of failing the import (and with it
+    the gunicorn worker); the thread keeps retrying until it succeeds.
+    """
+    global refresh_thread
+    try:
+        refresh_model()
+        app.logger.info("Loaded model generation %s", model_generation)
+    except Exception:
+        app.logger.exception("Initial model load failed; retrying every %ss", MODEL_RETRY_INTERVAL)
+    if model is None or MODEL_REFRESH_INTERVAL > 0:
+        refresh_thread = threading.Thread(target=_refresh_loop, name="model-refresh", daemon=True)
+        refresh_thread.start()
+
 def load_model():
-    storage_client = storage.Client()
-    bucket_name = "sid-ml-ops"
-    bucket = storage_client.get_bucket(bucket_name)
-    blob = bucket.blob("ml-artifacts/xgboost_coupon_recommendation.pkl")
-    blob.download_to_filename("xgboost_coupon_recommendation.pkl")
-    model = pickle.load(open("xgboost_coupon_recommendation.pkl", "rb"))
+    """The process-wide model. Only the refresh thread talks to GCS, never a request."""
+    if model is None:
+        raise ModelNotReady("Model is not loaded yet")
     return model
 
+start_model_loading()
+
 def preprocess(input_json):
     try:
         df = pd.DataFrame(input_json, index=[0])
@@ -75,14 +146,16 @@ def preprocess(input_json):
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    model = load_model()
     try : 
         input_json = request.get_json()
         df_preprocessed = preprocess(input_json)
+        model = load_model()
         y_predictions = model.predict(df_preprocessed)
         response = {'predictions': y_predictions.tolist()}
         return jsonify(response), 200
     
+    except ModelNotReady as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -93,6 +166,8 @@ def healthz():
 
 @app.route("/readyz", methods=["GET"])
 def readyz():
+    if model is None:
+        return {"status": "model not loaded"}, 503
     return {"status": "ready"}, 200
 
 if __name__ == '__main__':
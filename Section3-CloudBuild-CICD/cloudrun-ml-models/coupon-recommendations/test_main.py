@@ -1,4 +1,9 @@
+import pickle
+from types import SimpleNamespace
+
 import pytest
+
+import main
 from main import app, preprocess
 
 @pytest.fixture
@@ -7,6 +12,7 @@ def client():
         yield client
 
 def test_predict(client):
+    main.refresh_model()
     input_data = {
         "destination": "No Urgent Place",
         "passanger": "Kid(s)",
@@ -38,6 +44,7 @@ def test_predict(client):
     assert response.json["predictions"][0] in [0, 1]
 
 def test_predict_failure(client):
+    main.refresh_model()
     input_data = {
         "destination": ["No Urgent Place"],
         "passanger": ["Kid(s)"],
@@ -86,4 +93,29 @@ def test_preprocess():
         "direction_same": [0]
     }
     df = preprocess(input_data)
-    assert len(df.columns) == 39
\ No newline at end of file
+    assert len(df.columns) == 39
+
+
+def test_refresh_model_reloads_only_on_new_generation(monkeypatch):
+    downloads = []
+    blob = SimpleNamespace(generation=1)
+    blob.download_as_bytes = lambda: downloads.append(blob.generation) or pickle.dumps(f"model-v{blob.generation}")
+    monkeypatch.setattr(main, "_model_blob", lambda: blob)
+    monkeypatch.setattr(main, "model", None)
+    monkeypatch.setattr(main, "model_generation", None)
+
+    assert main.refresh_model()
+    assert not main.refresh_model()
+    assert main.model == "model-v1" and downloads == [1]
+
+    blob.generation = 2
+    assert main.refresh_model()
+    assert main.model == "model-v2" and downloads == [1, 2]
+
+def test_unloaded_model_returns_503(client, monkeypatch):
+    monkeypatch.setattr(main, "model", None)
+    monkeypatch.setattr(main, "preprocess", lambda input_json: input_json)
+    response = client.post("/predict", json={"destination": "No Urgent Place"})
+    assert response.status_code == 503
+    assert "error" in response.get_json()
+    assert client.get("/readyz").status_code == 503
@@ -4,7 +4,8 @@ gcloud projects add-iam-policy-binding 1090925531874 \
   --role='roles/aiplatform.admin'
 
 # Step-1
-docker build -t bikeshare-online-predict .
+# Run from the repository root (the image installs libs/bikeshare)
+docker build -t bikeshare-online-predict -f Section5-7-VertexAI-Development/Bikeshare-Model/Cloud-Run-Flask-Online-Prediction/Dockerfile .
 # Push to Container Registry 
 docker tag bikeshare-online-predict gcr.io/udemy-mlops/bikeshare-online-predict
 docker push gcr.io/udemy-mlops/bikeshare-online-predict
@@ -1,8 +1,16 @@
+import os
+
+from bikeshare import RawEncoder, load_encoder
 from flask import Flask, request, jsonify
 from google.cloud import aiplatform
 
 app = Flask(__name__)
 
+# One-hot layout from bikeshare.fit_encoder, saved by python-sdk/model-training-code.py.
+ENCODER_PATH = os.environ.get("ENCODER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "encoder.json"))
+encoder = RawEncoder(load_encoder(ENCODER_PATH))
+
+
 def predict_instance(project_id, endpoint_id, instance):
     endpoint = aiplatform.Endpoint('projects/{}/locations/us-central1/endpoints/{}'.format(project_id, endpoint_id))
     instances_list = [instance]
@@ -13,6 +21,13 @@ def predict_instance(project_id, endpoint_id, instance):
 def predict():
     data = request.get_json(force=True) 
     instance = data['instance']
+    # Raw hour.csv fields ({"season": 1, "mnth": 1, "hr": 0, ...}) are encoded
+    # here; a list is passed through as the already one-hot encoded instance.
+    if isinstance(instance, dict):
+        try:
+            instance = encoder.encode(instance)
+        except ValueError as e:
+            return jsonify({'error': f"Invalid instance: {e}"}), 400
     endpoint_id = 8190565580512690176
     project_id = 1090925531874
     prediction = predict_instance(project_id, endpoint_id, instance)
@@ -22,3 +37,4 @@ if __name__ == '__main__':
     app.run(debug=True,host='0.0.0.0', port=5000)
 
 # curl -X POST -H "Content-Type: application/json" -d '{"instance": [0.24, 0.81, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0]}' https://bikeshare-online-predict-ucinc65roa-uc.a.run.app/predict
+# curl -X POST -H "Content-Type: application/json" -d '{"instance": {"season": 1, "mnth": 1, "hr": 0, "holiday": 0, "weekday": 6, "workingday": 0, "weathersit": 1, "temp": 0.24, "hum": 0.81}}' https://bikeshare-online-predict-ucinc65roa-uc.a.run.app/predict
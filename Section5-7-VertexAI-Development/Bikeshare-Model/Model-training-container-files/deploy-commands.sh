@@ -1,6 +1,7 @@
 
-# Step-1 - Build the image 
-docker build -t vertex-bikeshare-model .
+# Step-1 - Build the image (from the repository root, so the shared bikeshare package is included)
+cd "$(git rev-parse --show-toplevel)"
+docker build -t vertex-bikeshare-model -f Section5-7-VertexAI-Development/Bikeshare-Model/Model-training-container-files/Dockerfile .
 
 # Step-2 - Tag the image locally
 docker tag vertex-bikeshare-model gcr.io/udemy-mlops/vertex-bikeshare-model
@@ -0,0 +1,62 @@
+"""Loading hour.csv: bare read_csv vs the typed, column-pruned loader and its Parquet cache.
+
+"frame MiB" is the loaded DataFrame's deep memory usage. Each variant is the
+best of --repeat runs; the cache row reads the copy the first typed load wrote.
+
+    python benchmarks/bench_load.py --copies 1
+    python benchmarks/bench_load.py --copies 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "tests"))
+
+from bikeshare import load_data  # noqa: E402
+from conftest import HOUR_CSV  # noqa: E402
+
+
+def best_of(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hour.csv")
+        with open(HOUR_CSV) as f:
+            header, *lines = f.readlines()
+        with open(path, "w") as f:
+            f.write(header + "".join(lines * args.copies))
+        cache = os.path.join(tmp, "cache")
+        print(f"input: {len(lines) * args.copies} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        load_data(path, cache_dir=cache)  # populate the cache
+        rows = {
+            "pd.read_csv (inferred, all)": lambda: pd.read_csv(path),
+            "typed + pruned, no cache": lambda: load_data(path, cache_dir=""),
+            "typed, all columns, no cache": lambda: load_data(path, columns=None, cache_dir=""),
+            "Parquet cache hit": lambda: load_data(path, cache_dir=cache),
+        }
+        print(f"{'variant':<30} {'seconds':>8} {'frame MiB':>10}")
+        for name, fn in rows.items():
+            elapsed, df = best_of(fn, args.repeat)
+            print(f"{name:<30} {elapsed:>8.3f} {df.memory_usage(deep=True).sum() / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
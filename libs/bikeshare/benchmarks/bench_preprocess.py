@@ -0,0 +1,76 @@
+"""preprocess_data time and peak memory on hour.csv replicated --copies times.
+
+Each variant runs in a fresh process that first loads the replicated CSV.
+"peak MiB" is the most memory preprocessing had allocated at once (traced
+with tracemalloc, which sees NumPy/pandas buffers), excluding the input frame.
+Timings come from a separate, untraced run.
+
+    python benchmarks/bench_preprocess.py --copies 100
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "tests"))
+
+import bikeshare  # noqa: E402
+from conftest import HOUR_CSV, reference_preprocess_data  # noqa: E402
+
+VARIANTS = ["reference", "single-pass bool", "single-pass uint8", "sparse block"]
+
+
+def measure(variant, path):
+    df = pd.read_csv(path)
+    if variant == "reference":
+        run = lambda: reference_preprocess_data(df)
+    elif variant == "single-pass bool":
+        run = lambda: bikeshare.preprocess_data(df)
+    elif variant == "single-pass uint8":
+        run = lambda: bikeshare.preprocess_data(df, dtype=np.uint8)
+    else:
+        run = lambda: bikeshare.one_hot_block(df, bikeshare.fit_encoder(df), dtype=np.uint8, sparse=True)
+
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    print(f"{elapsed} {peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=100)
+    parser.add_argument("--measure", nargs=2, metavar=("VARIANT", "CSV"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hour.csv")
+        with open(HOUR_CSV) as f:
+            header, *lines = f.readlines()
+        with open(path, "w") as f:
+            f.write(header + "".join(lines * args.copies))
+        print(f"input: {len(lines) * args.copies} rows, {os.path.getsize(path) / 1e6:.0f} MB")
+        print(f"{'variant':<20} {'seconds':>8} {'peak MiB':>9}")
+        for variant in VARIANTS:
+            out = subprocess.run([sys.executable, __file__, "--measure", variant, path],
+                                 check=True, capture_output=True, text=True).stdout
+            elapsed, peak = map(float, out.split())
+            print(f"{variant:<20} {elapsed:>8.2f} {peak:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
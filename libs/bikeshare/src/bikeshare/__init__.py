@@ -0,0 +1,35 @@
+"""Shared bikeshare demand model code: hour.csv loading, features and training."""
+from bikeshare.data import FEATURE_COLUMNS, HOUR_DTYPES, load_data, source_checksum
+from bikeshare.features import (
+    CATEGORICAL_FIELDS,
+    NUMERIC_FIELDS,
+    RawEncoder,
+    fit_encoder,
+    load_encoder,
+    one_hot_block,
+    preprocess_data,
+    save_encoder,
+)
+from bikeshare.models import MODEL_REGISTRY, build_model, register_model, train_model
+from bikeshare.training import rmse, save_model_artifact
+
+__all__ = [
+    "CATEGORICAL_FIELDS",
+    "FEATURE_COLUMNS",
+    "HOUR_DTYPES",
+    "MODEL_REGISTRY",
+    "NUMERIC_FIELDS",
+    "RawEncoder",
+    "build_model",
+    "fit_encoder",
+    "load_data",
+    "load_encoder",
+    "one_hot_block",
+    "preprocess_data",
+    "register_model",
+    "rmse",
+    "save_encoder",
+    "save_model_artifact",
+    "source_checksum",
+    "train_model",
+]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Compact dtypes for every hour.csv column, so read_csv never infers them.
+# Category codes fit in int8 and counts in int16 (max 977). The float columns
+# stay float64 so features match an untyped read exactly (SVR trains on them
+# as given).
+HOUR_DTYPES: dict[str, str] = {
+    "instant": "int32",
+    "dteday": "category",
+    "season": "int8",
+    "yr": "int8",
+    "mnth": "int8",
+    "hr": "int8",
+    "holiday": "int8",
+    "weekday": "int8",
+    "workingday": "int8",
+    "weathersit": "int8",
+    "temp": "float64",
+    "atemp": "float64",
+    "hum": "float64",
+    "windspeed": "float64",
+    "casual": "int16",
+    "registered": "int16",
+    "cnt": "int16",
+}
+
+# The columns preprocess_data uses; instant, dteday, yr, atemp, windspeed,
+# casual and registered are never read unless asked for.
+FEATURE_COLUMNS: tuple[str, ...] = (
+    "season", "mnth", "hr", "holiday", "weekday", "workingday", "weathersit", "temp", "hum", "cnt",
+)
+
+# Parquet copies of parsed CSVs live here; set BIKESHARE_CACHE_DIR="" to disable.
+DEFAULT_CACHE_DIR = os.environ.get("BIKESHARE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "bikeshare"))
+
+
+def source_checksum(filename: str) -> str:
+    """Content checksum of a local file, or the stored MD5/CRC32C of a gs:// object (no download)."""
+    if filename.startswith("gs://"):
+        from google.cloud import storage
+
+        bucket_name, _, blob_name = filename[len("gs://"):].partition("/")
+        blob = storage.Client().bucket(bucket_name).get_blob(blob_name)
+        if blob is None:
+            raise FileNotFoundError(filename)
+        return f"md5:{blob.md5_hash}" if blob.md5_hash else f"crc32c:{blob.crc32c}"
+
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def _cache_path(cache_dir: str, checksum: str, dtypes: dict[str, str]) -> str:
+    # The column set and dtypes are part of the key, so different selections never collide.
+    key = hashlib.sha256(json.dumps([checksum, dtypes]).encode()).hexdigest()[:24]
+    return os.path.join(cache_dir, f"hour-{key}.parquet")
+
+
+def _write_cache(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".parquet")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_data(
+    filename: str,
+    columns: Sequence[str] | None = FEATURE_COLUMNS,
+    cache_dir: str | None = None,
+) -> pd.DataFrame:
+    """Read hour.csv from a local path or gs:// URI (gs:// reads need gcsfs).
+
+    Only ``columns`` are parsed (all of them with ``columns=None``), each
+    with its ``HOUR_DTYPES`` dtype. The result is cached as Parquet in
+    ``cache_dir`` (default ``DEFAULT_CACHE_DIR``; "" disables) under the
+    source checksum, so a later load of unchanged data skips CSV parsing.
+    """
+    names = list(HOUR_DTYPES) if columns is None else list(columns)
+    dtypes = {name: HOUR_DTYPES[name] for name in names}
+    cache_dir = DEFAULT_CACHE_DIR if cache_dir is None else cache_dir
+
+    path = None
+    if cache_dir:
+        path = _cache_path(cache_dir, source_checksum(filename), dtypes)
+        if os.path.exists(path):
+            logger.info("Loading %s from Parquet cache %s", filename, path)
+            return pd.read_parquet(path)
+
+    df = pd.read_csv(filename, usecols=names, dtype=dtypes)[names]
+    if path is not None:
+        try:
+            _write_cache(df, path)
+        except (ImportError, OSError) as e:
+            logger.warning("Could not write Parquet cache %s: %s", path, e)
+    return df
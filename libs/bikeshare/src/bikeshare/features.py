@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+
+# Raw hour.csv field -> model feature name.
+NUMERIC_FIELDS: dict[str, str] = {"temp": "temp", "hum": "humidity"}
+CATEGORICAL_FIELDS: dict[str, str] = {
+    "season": "season",
+    "mnth": "month",
+    "hr": "hour",
+    "holiday": "holiday",
+    "weekday": "weekday",
+    "workingday": "workingday",
+    "weathersit": "weather",
+}
+
+Encoder = dict[str, Any]
+
+
+def fit_encoder(df: pd.DataFrame) -> Encoder:
+    """Frozen one-hot layout for hour.csv-style data; saved with the model as encoder.json.
+
+    Records each categorical field's sorted categories in ``df``; the first
+    one is the dropped baseline. ``columns`` is the resulting feature order.
+    Serving apps use the same file to encode raw request fields.
+    """
+    categorical = {
+        raw: {"name": name, "categories": sorted(df[raw].unique().tolist())}
+        for raw, name in CATEGORICAL_FIELDS.items()
+    }
+    columns = list(NUMERIC_FIELDS.values()) + [
+        f"{entry['name']}_{category}" for entry in categorical.values() for category in entry["categories"][1:]
+    ]
+    return {"numeric": dict(NUMERIC_FIELDS), "categorical": categorical, "columns": columns}
+
+
+def save_encoder(encoder: Encoder, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(encoder, f)
+
+
+def load_encoder(path: str) -> Encoder:
+    with open(path) as f:
+        return json.load(f)
+
+
+class RawEncoder:
+    """An encoder compiled for one raw request at a time, as the serving apps need.
+
+    Each raw field maps straight to the position it sets in a feature row:
+    numeric fields to their feature column, each category to its dummy
+    column (or to nothing for the dropped baseline category). Pass the
+    model's ``columns`` to check they match the encoder's layout.
+    """
+
+    def __init__(self, encoder: Encoder, columns: Sequence[str] | None = None) -> None:
+        if columns is not None and list(columns) != encoder["columns"]:
+            raise ValueError("Encoder columns do not match the model's features")
+        position = {name: i for i, name in enumerate(encoder["columns"])}
+        self.width = len(position)
+        self.numeric = [(raw, position[name]) for raw, name in encoder["numeric"].items()]
+        self.categorical = []
+        for raw, entry in encoder["categorical"].items():
+            baseline, *rest = entry["categories"]
+            positions = {baseline: None}
+            positions.update((category, position[f"{entry['name']}_{category}"]) for category in rest)
+            self.categorical.append((raw, positions))
+        self.fields = frozenset(raw for raw, _ in self.numeric + self.categorical)
+        # None of these is also a feature column name (temp is), so they mark a raw payload.
+        self.categorical_fields = frozenset(raw for raw, _ in self.categorical)
+
+    def matches(self, payload: dict[str, Any]) -> bool:
+        return not self.categorical_fields.isdisjoint(payload)
+
+    def encode(self, payload: dict[str, Any], row: Any = None) -> Any:
+        """Write ``payload``'s raw fields into ``row`` (a list or 1-D array of ``width``).
+
+        A new list is returned when ``row`` is None. Other keys in
+        ``payload`` are ignored; missing fields and unknown categories raise
+        ``ValueError``.
+        """
+        missing = self.fields - payload.keys()
+        if missing:
+            raise ValueError(f"Missing raw fields {sorted(missing)}")
+        if row is None:
+            row = [0.0] * self.width
+        else:
+            row[:] = [0.0] * self.width
+        for raw, position in self.numeric:
+            row[position] = float(payload[raw])
+        for raw, positions in self.categorical:
+            value = payload[raw]
+            try:
+                category = int(value)
+                if category != float(value):
+                    raise ValueError(value)
+                position = positions[category]
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Unknown {raw} value {value!r}; expected one of {list(positions)}") from None
+            if position is not None:
+                row[position] = 1.0
+        return row
+
+
+def one_hot_block(df: pd.DataFrame, encoder: Encoder, dtype: Any = bool, sparse: bool = False) -> Any:
+    """All dummy columns of ``df`` in one (n_rows, n_dummies) array.
+
+    Each categorical field is mapped to category codes once and its ones are
+    scattered straight into a single preallocated block (or collected into a
+    CSR matrix with ``sparse=True``). Values outside the encoder's categories
+    raise ``ValueError``.
+    """
+    n = len(df)
+    width = len(encoder["columns"]) - len(encoder["numeric"])
+    block = None if sparse else np.zeros((n, width), dtype=dtype)
+    row_ids, col_ids = [], []
+    offset = 0
+    for raw, entry in encoder["categorical"].items():
+        categories = entry["categories"]
+        codes = pd.Categorical(df[raw], categories=categories).codes
+        if (codes < 0).any():
+            unknown = sorted(set(df[raw][codes < 0].tolist()))
+            raise ValueError(f"{raw} has values outside the encoder's categories: {unknown}")
+        hot = np.flatnonzero(codes > 0)  # code 0 is the dropped baseline
+        cols = offset + codes[hot].astype(np.int32) - 1
+        if sparse:
+            row_ids.append(hot.astype(np.int32))
+            col_ids.append(cols)
+        else:
+            block[hot, cols] = 1
+        offset += len(categories) - 1
+
+    if sparse:
+        rows, cols = np.concatenate(row_ids), np.concatenate(col_ids)
+        return sp.csr_matrix((np.ones(len(rows), dtype=dtype), (rows, cols)), shape=(n, width))
+    return block
+
+
+def preprocess_data(
+    df: pd.DataFrame, encoder: Encoder | None = None, dtype: Any = bool
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Model features and log(cnt) target from hour.csv data.
+
+    Uses ``encoder``'s frozen categories, or fits them on ``df``. Features
+    are the numeric fields followed by every dummy column, built in one pass
+    (bool by default, like pd.get_dummies; pass ``dtype=np.uint8`` etc.).
+    """
+    if encoder is None:
+        encoder = fit_encoder(df)
+    numeric = encoder["numeric"]
+    block = one_hot_block(df, encoder, dtype=dtype)
+    X = pd.DataFrame(block, columns=encoder["columns"][len(numeric):], index=df.index)
+    for position, (raw, name) in enumerate(numeric.items()):
+        X.insert(position, name, df[raw].to_numpy())
+    y = np.log(df["cnt"].astype(np.float64)).rename("count")
+    return X, y
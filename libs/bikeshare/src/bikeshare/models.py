@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from sklearn.pipeline import Pipeline, make_pipeline
+
+ModelFactory = Callable[..., Any]
+
+# Model name -> factory taking that model's hyperparameters as keyword arguments.
+MODEL_REGISTRY: dict[str, ModelFactory] = {}
+
+
+def register_model(*names: str) -> Callable[[ModelFactory], ModelFactory]:
+    """Register a model factory under one or more names."""
+
+    def decorator(factory: ModelFactory) -> ModelFactory:
+        for name in names:
+            MODEL_REGISTRY[name] = factory
+        return factory
+
+    return decorator
+
+
+@register_model("random_forest", "random_forest_regressor")
+def _random_forest(**params: Any) -> Any:
+    from sklearn.ensemble import RandomForestRegressor
+
+    return RandomForestRegressor(**params)
+
+
+@register_model("xgboost")
+def _xgboost(**params: Any) -> Any:
+    from xgboost import XGBRegressor  # optional dependency: pip install bikeshare[xgboost]
+
+    return XGBRegressor(**params)
+
+
+@register_model("svr")
+def _svr(**params: Any) -> Any:
+    from sklearn.svm import SVR
+
+    return SVR(**params)
+
+
+def build_model(name: str, **params: Any) -> Any:
+    try:
+        factory = MODEL_REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Invalid model_name {name!r}. Choose from {sorted(MODEL_REGISTRY)}.") from None
+    return factory(**params)
+
+
+def train_model(x_train: Any, y_train: Any, model_name: str = "random_forest", **params: Any) -> Pipeline:
+    """Fit a one-step pipeline around the registered model ``model_name``."""
+    pipeline = make_pipeline(build_model(model_name, **params))
+    pipeline.fit(x_train, y_train)
+    return pipeline
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import numpy as np
+from joblib import dump
+from sklearn.metrics import mean_squared_error
+
+from bikeshare.features import Encoder, save_encoder
+
+MODEL_FILENAME = "model.joblib"
+ENCODER_FILENAME = "encoder.json"
+
+
+def rmse(y_true: Any, y_pred: Any) -> float:
+    return float(np.sqrt(mean_squared_error(y_true, y_pred)))
+
+
+def save_model_artifact(
+    pipeline: Any,
+    encoder: Encoder | None = None,
+    bucket: Any = None,
+    prefix: str = "",
+    directory: str = ".",
+    compress: int = 0,
+) -> list[str]:
+    """Write model.joblib (and encoder.json) to ``directory``; upload them when ``bucket`` is given.
+
+    ``bucket`` is a google.cloud.storage Bucket and ``prefix`` the blob
+    folder, e.g. ``"bikeshare-model/artifact/"``. Returns the local paths.
+    """
+    paths = [os.path.join(directory, MODEL_FILENAME)]
+    dump(pipeline, paths[0], compress=compress)
+    if encoder is not None:
+        paths.append(os.path.join(directory, ENCODER_FILENAME))
+        save_encoder(encoder, paths[1])
+    if bucket is not None:
+        for path in paths:
+            bucket.blob(prefix + os.path.basename(path)).upload_from_filename(path)
+    return paths
@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bikeshare import load_data
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HOUR_CSV = os.path.join(HERE, "..", "..", "..", "Section3-CloudBuild-CICD", "cloudrun-ml-models", "bikeshare-model", "hour.csv")
+
+
+def reference_preprocess_data(df):
+    """preprocess_data as every training script had it before this package."""
+    df = df.rename(columns={'weathersit': 'weather', 'yr': 'year', 'mnth': 'month', 'hr': 'hour',
+                            'hum': 'humidity', 'cnt': 'count'})
+    df = df.drop(columns=['instant', 'dteday', 'year'])
+    cols = ['season', 'month', 'hour', 'holiday', 'weekday', 'workingday', 'weather']
+    for col in cols:
+        df[col] = df[col].astype('category')
+    df['count'] = np.log(df['count'])
+    df_oh = df.copy()
+    for col in cols:
+        df_oh = pd.concat([df_oh, pd.get_dummies(df_oh[col], prefix=col, drop_first=True)], axis=1)
+        df_oh = df_oh.drop([col], axis=1)
+    X = df_oh.drop(columns=['atemp', 'windspeed', 'casual', 'registered', 'count'], axis=1)
+    return X, df_oh['count']
+
+
+@pytest.fixture(scope="session")
+def hour():
+    return load_data(HOUR_CSV, cache_dir="")
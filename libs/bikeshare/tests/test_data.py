@@ -0,0 +1,55 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from bikeshare import FEATURE_COLUMNS, HOUR_DTYPES, load_data, source_checksum
+from conftest import HOUR_CSV
+
+
+@pytest.fixture
+def csv(tmp_path):
+    path = tmp_path / "hour.csv"
+    shutil.copy(HOUR_CSV, path)
+    return str(path)
+
+
+def test_load_data_reads_only_feature_columns_with_compact_dtypes(hour):
+    assert list(hour.columns) == list(FEATURE_COLUMNS)
+    assert {name: str(dtype) for name, dtype in hour.dtypes.items()} == {name: HOUR_DTYPES[name] for name in FEATURE_COLUMNS}
+    assert len(hour) == 17379
+
+
+def test_load_data_can_read_every_column(csv):
+    df = load_data(csv, columns=None, cache_dir="")
+    assert list(df.columns) == list(HOUR_DTYPES)
+    assert str(df["dteday"].dtype) == "category"
+
+
+def test_second_load_comes_from_parquet_cache(csv, tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    first = load_data(csv, cache_dir=cache)
+    assert len(os.listdir(cache)) == 1
+
+    def no_csv(*args, **kwargs):
+        raise AssertionError("CSV parsed despite a cached copy")
+
+    monkeypatch.setattr(pd, "read_csv", no_csv)
+    pd.testing.assert_frame_equal(load_data(csv, cache_dir=cache), first)
+
+
+def test_cache_is_keyed_by_content_and_columns(csv, tmp_path):
+    cache = str(tmp_path / "cache")
+    before = source_checksum(csv)
+    load_data(csv, cache_dir=cache)
+    load_data(csv, columns=["hr", "cnt"], cache_dir=cache)
+    assert len(os.listdir(cache)) == 2
+
+    with open(csv) as f:
+        header, *lines = f.readlines()
+    with open(csv, "w") as f:
+        f.write(header + "".join(lines[:100]))
+    assert source_checksum(csv) != before
+    assert len(load_data(csv, cache_dir=cache)) == 100
+    assert len(os.listdir(cache)) == 3
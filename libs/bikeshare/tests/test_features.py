@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bikeshare import RawEncoder, fit_encoder, load_encoder, one_hot_block, preprocess_data, save_encoder
+from conftest import HOUR_CSV, reference_preprocess_data
+
+
+def test_preprocess_data_matches_reference():
+    # The reference reads the CSV with inferred dtypes, as the scripts did.
+    raw = pd.read_csv(HOUR_CSV)
+    X, y = preprocess_data(raw)
+    X_ref, y_ref = reference_preprocess_data(raw)
+    pd.testing.assert_frame_equal(X, X_ref, check_exact=True)
+    pd.testing.assert_series_equal(y, y_ref, check_exact=True)
+
+
+def test_typed_load_gives_the_same_features(hour):
+    X, y = preprocess_data(hour)
+    X_ref, y_ref = reference_preprocess_data(pd.read_csv(HOUR_CSV))
+    pd.testing.assert_frame_equal(X, X_ref, check_exact=True)
+    pd.testing.assert_series_equal(y, y_ref, check_exact=True)
+
+
+def test_frozen_encoder_keeps_columns_for_a_subset(hour):
+    encoder = fit_encoder(hour)
+    subset = hour[hour['season'] == 2]
+    X, _ = preprocess_data(subset, encoder, dtype=np.uint8)
+    assert list(X.columns) == encoder['columns']
+    assert X['season_2'].dtype == np.uint8 and X['season_2'].all() and not X['season_3'].any()
+
+
+def test_sparse_block_matches_dense(hour):
+    encoder = fit_encoder(hour)
+    dense = one_hot_block(hour, encoder)
+    sparse = one_hot_block(hour, encoder, dtype=np.uint8, sparse=True)
+    assert (sparse.toarray() == dense).all()
+
+
+def test_unknown_category_is_rejected(hour):
+    encoder = fit_encoder(hour)
+    with pytest.raises(ValueError, match="hr has values outside"):
+        preprocess_data(hour.assign(hr=hour['hr'] + 1), encoder)
+
+
+def test_encoder_round_trips_through_json(hour, tmp_path):
+    encoder = fit_encoder(hour)
+    save_encoder(encoder, str(tmp_path / "encoder.json"))
+    assert load_encoder(str(tmp_path / "encoder.json")) == encoder
+
+
+def test_raw_encoder_matches_preprocess_data(hour):
+    encoder = fit_encoder(hour)
+    X, _ = preprocess_data(hour, encoder)
+    raw_encoder = RawEncoder(encoder, X.columns)
+    row = np.empty(raw_encoder.width)
+    for i in (0, 17, len(hour) - 1):
+        payload = hour.iloc[i].to_dict()
+        assert raw_encoder.matches(payload)
+        assert raw_encoder.encode(payload) == X.iloc[i].astype(float).tolist()
+        assert (raw_encoder.encode(payload, row) == X.iloc[i].to_numpy(dtype=float)).all()
+
+    with pytest.raises(ValueError, match="Unknown hr value 24"):
+        raw_encoder.encode({**hour.iloc[0].to_dict(), "hr": 24})
+    with pytest.raises(ValueError, match=r"Missing raw fields \['hum'\]"):
+        raw_encoder.encode(hour.iloc[0].drop("hum").to_dict())
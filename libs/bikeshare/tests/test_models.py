@@ -0,0 +1,46 @@
+import pytest
+from sklearn.pipeline import Pipeline
+
+from bikeshare import MODEL_REGISTRY, build_model, preprocess_data, register_model, rmse, save_model_artifact, train_model
+
+
+def test_unknown_model_name_is_rejected():
+    with pytest.raises(ValueError, match="Invalid model_name 'invalid_model_name'"):
+        build_model("invalid_model_name")
+
+
+def test_registered_model_is_trained_in_a_pipeline(hour):
+    X, y = preprocess_data(hour.iloc[:2000])
+    pipeline = train_model(X, y, "random_forest", n_estimators=5, max_depth=4, random_state=0)
+    assert isinstance(pipeline, Pipeline)
+    assert rmse(y, pipeline.predict(X)) < 2
+
+
+def test_register_model_adds_a_factory(monkeypatch):
+    monkeypatch.setattr("bikeshare.models.MODEL_REGISTRY", dict(MODEL_REGISTRY))
+
+    @register_model("constant")
+    def constant(value=1.0):
+        from sklearn.dummy import DummyRegressor
+
+        return DummyRegressor(strategy="constant", constant=value)
+
+    assert build_model("constant", value=2.0).constant == 2.0
+
+
+def test_save_model_artifact_writes_and_uploads(hour, tmp_path):
+    X, y = preprocess_data(hour.iloc[:500])
+    pipeline = train_model(X, y, n_estimators=2, random_state=0)
+    uploaded = []
+
+    class Bucket:
+        def blob(self, name):
+            class Blob:
+                def upload_from_filename(self, path):
+                    uploaded.append((name, path))
+
+            return Blob()
+
+    paths = save_model_artifact(pipeline, {"columns": []}, bucket=Bucket(), prefix="artifact/", directory=str(tmp_path))
+    assert [name for name, _ in uploaded] == ["artifact/model.joblib", "artifact/encoder.json"]
+    assert [path for _, path in uploaded] == paths